@@ -0,0 +1,47 @@
+from django.urls import path, re_path
+
+from .async_views import (
+    AsyncFragmentListView,
+    AsyncFragmentRetrieveView,
+    AsyncListView,
+    AsyncNestedListView,
+    AsyncRetrieveView,
+)
+from .views import CategoryViewSet, GenreViewSet, ReviewViewSet, TitleViewSet
+
+urlpatterns = [
+    path(
+        'categories/',
+        AsyncListView.as_view(CategoryViewSet, basename='categories'),
+        name='categories-list',
+    ),
+    path(
+        'genres/',
+        AsyncListView.as_view(GenreViewSet, basename='genres'),
+        name='genres-list',
+    ),
+    path(
+        'titles/',
+        AsyncFragmentListView.as_view(TitleViewSet, basename='titles'),
+        name='titles-list',
+    ),
+    re_path(
+        r'^titles/(?P<pk>[^/.]+)/$',
+        AsyncFragmentRetrieveView.as_view(
+            TitleViewSet, basename='titles', detail=True
+        ),
+        name='titles-detail',
+    ),
+    re_path(
+        r'^titles/(?P<title_id>\d+)/reviews/$',
+        AsyncNestedListView.as_view(ReviewViewSet, basename='reviews'),
+        name='reviews-list',
+    ),
+    re_path(
+        r'^titles/(?P<title_id>\d+)/reviews/(?P<pk>[^/.]+)/$',
+        AsyncRetrieveView.as_view(
+            ReviewViewSet, basename='reviews', detail=True
+        ),
+        name='reviews-detail',
+    ),
+]
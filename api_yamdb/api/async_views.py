@@ -0,0 +1,257 @@
+"""Асинхронное чтение каталога для ASGI-приложения.
+
+В Django 3.2 нет асинхронного ORM, поэтому каждое обращение к БД
+уходит в отдельный пул из ASYNC_DB_THREADS потоков, а независимые запросы
+(страница, COUNT, проверка родителя) выполняются одновременно. Версии
+для ETag читаются раньше данных. Проверки доступа, фильтры, пагинация,
+сериализаторы и кэши берутся из вьюсетов DRF, поэтому ответы совпадают
+с синхронными. То, что здесь не поддерживается (курсорная пагинация,
+`?count=false`, browsable API), обрабатывает синхронный вьюсет.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import close_old_connections
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotAcceptable, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .mixins import is_not_modified, not_modified_response
+
+DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix='async-db'
+)
+
+
+async def run_query(func, *args, **kwargs):
+    """Выполняет блокирующую работу с БД и кэшем в пуле DB_EXECUTOR.
+
+    Соединение потока закрывается по правилам CONN_MAX_AGE, как в конце
+    обычного запроса.
+    """
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        DB_EXECUTOR, context.run, call
+    )
+
+
+def to_http_response(response):
+    """Отрисованный ответ DRF в виде обычного HttpResponse.
+
+    Ответ с отложенным рендерингом Django отрисовал бы сам, переключившись
+    в синхронный поток.
+    """
+    response.render()
+    http_response = HttpResponse(
+        response.content, status=response.status_code
+    )
+    for header, value in response.items():
+        http_response[header] = value
+    return http_response
+
+
+class AsyncReadView:
+    """Асинхронная обработка GET-запроса к действию вьюсета DRF.
+
+    Экземпляр создается на каждый запрос. Вьюсет отвечает за проверки
+    доступа, фильтрацию, сериализацию и оформление ответа, здесь
+    решается, какие запросы к БД выполнить и в каком порядке: подклассы
+    для действий list и retrieve задают get_data_response(request).
+    """
+
+    action = None
+
+    def __init__(self, viewset_class, initkwargs, sync_view):
+        self.viewset = viewset_class(**initkwargs)
+        self.viewset.action_map = {'get': self.action, 'head': self.action}
+        self.sync_view = sync_view
+
+    @classmethod
+    def as_view(cls, viewset_class, **initkwargs):
+        sync_view = viewset_class.as_view({'get': cls.action}, **initkwargs)
+
+        async def view(request, *args, **kwargs):
+            handler = cls(viewset_class, initkwargs, sync_view)
+            return await handler.dispatch(request, *args, **kwargs)
+
+        view.csrf_exempt = True
+        view.sync_view = sync_view
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        viewset = self.viewset
+        viewset.args = args
+        viewset.kwargs = kwargs
+        drf_request = viewset.initialize_request(request, *args, **kwargs)
+        viewset.request = drf_request
+        viewset.headers = viewset.default_response_headers
+        viewset.format_kwarg = viewset.get_format_suffix(**kwargs)
+        if not self.is_supported(drf_request):
+            return await sync_to_async(self.sync_view)(
+                request, *args, **kwargs
+            )
+        try:
+            await run_query(viewset.initial, drf_request, *args, **kwargs)
+            response = await self.get_response(drf_request)
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        response = viewset.finalize_response(
+            drf_request, response, *args, **kwargs
+        )
+        return to_http_response(response)
+
+    def is_supported(self, request):
+        """Можно ли ответить без синхронного вьюсета."""
+        try:
+            renderer, _ = self.viewset.perform_content_negotiation(request)
+        except NotAcceptable:
+            return False
+        return isinstance(renderer, JSONRenderer)
+
+    async def get_response(self, request):
+        """Ответ с ETag; версии читаются до данных.
+
+        Иначе запись, зафиксированная между чтениями, дала бы старые
+        данные под новым ETag, и клиент получал бы на них 304. Для ответа
+        304 данные не читаются.
+        """
+        etag = await run_query(self.viewset.get_etag, request)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response = await self.get_data_response(request)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+
+class AsyncListView(AsyncReadView):
+    """Список с постраничной пагинацией: COUNT и страница одновременно."""
+
+    action = 'list'
+
+    def is_supported(self, request):
+        if not super().is_supported(request):
+            return False
+        paginator = self.viewset.paginator
+        if paginator is None:
+            return True
+        cursor_param = getattr(paginator, 'cursor_query_param', None)
+        page = request.query_params.get(paginator.page_query_param, '1')
+        return (
+            cursor_param not in request.query_params
+            and paginator.get_with_count(request)
+            and page.isdigit()
+            and int(page) > 0
+        )
+
+    def get_cached_response(self, request):
+        """Ключ и ответ из кэша, выполняется в пуле потоков."""
+        key = self.viewset.get_cache_key(request)
+        return key, self.viewset.get_cached_response(key, request)
+
+    async def get_response(self, request):
+        """Кэш ответов вьюсета; обращения к кэшу не блокируют цикл."""
+        if getattr(self.viewset, 'cache_resource', None) is None:
+            return await super().get_response(request)
+        key, response = await run_query(self.get_cached_response, request)
+        if response is None:
+            response = await super().get_response(request)
+            await run_query(self.viewset.cache_response, key, response)
+        return response
+
+    def get_queryset(self):
+        return self.viewset.get_queryset()
+
+    def get_page_queryset(self, queryset):
+        """Что выбирать для страницы."""
+        return queryset
+
+    def render(self, objects):
+        """Сериализует строки страницы, выполняется в пуле потоков."""
+        return self.viewset.get_serializer(list(objects), many=True).data
+
+    async def get_data_response(self, request):
+        viewset = self.viewset
+        queryset = self.get_page_queryset(
+            viewset.filter_queryset(self.get_queryset())
+        )
+        paginator = viewset.paginator
+        page_size = paginator and paginator.get_page_size(request)
+        if not page_size:
+            return Response(await run_query(self.render, queryset))
+
+        number = int(request.query_params.get(paginator.page_query_param, 1))
+        offset = (number - 1) * page_size
+        count, data = await asyncio.gather(
+            run_query(queryset.count),
+            run_query(self.render, queryset[offset:offset + page_size]),
+        )
+        django_paginator = paginator.django_paginator_class(
+            queryset, page_size
+        )
+        django_paginator.count = count
+        try:
+            page = django_paginator.page(number)
+        except InvalidPage as exc:
+            raise NotFound(paginator.invalid_page_message.format(
+                page_number=number, message=str(exc)
+            ))
+        page.object_list = data
+        paginator.set_page(request, page)
+        return paginator.get_paginated_response(data)
+
+
+class AsyncFragmentListView(AsyncListView):
+    """Список вьюсета с FragmentCacheMixin: id с версиями и представления."""
+
+    def get_page_queryset(self, queryset):
+        return self.viewset.get_fragment_rows(queryset)
+
+    def render(self, rows):
+        return self.viewset.get_rendered(list(rows))
+
+
+class AsyncNestedListView(AsyncListView):
+    """Список вложенного ресурса: родитель проверяется параллельно."""
+
+    def get_queryset(self):
+        return self.viewset.get_children()
+
+    async def get_data_response(self, request):
+        _, response = await asyncio.gather(
+            run_query(self.viewset.get_parent),
+            super().get_data_response(request),
+        )
+        return response
+
+
+class AsyncRetrieveView(AsyncReadView):
+    """Отдельный объект."""
+
+    action = 'retrieve'
+
+    def render_object(self):
+        viewset = self.viewset
+        return viewset.get_serializer(viewset.get_object()).data
+
+    async def get_data_response(self, request):
+        return Response(await run_query(self.render_object))
+
+
+class AsyncFragmentRetrieveView(AsyncRetrieveView):
+    """Объект вьюсета с FragmentCacheMixin: сериализация берется из кэша."""
+
+    def render_object(self):
+        return self.viewset.render_object()
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """Процессный кэш пользователей с коротким временем жизни.
+
+    Хранит значения полей, а не экземпляры: каждый запрос получает свой
+    объект пользователя и может его менять.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            expires, db, values = entry
+            if expires < time.monotonic():
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        model = get_user_model()
+        return model.from_db(
+            db, [field.attname for field in model._meta.concrete_fields],
+            values,
+        )
+
+    def set(self, user_id, user):
+        values = [
+            getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+        ]
+        expires = time.monotonic() + settings.JWT_USER_CACHE_TIMEOUT
+        with self.lock:
+            self.entries[user_id] = (expires, user._state.db, values)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса к таблице пользователей.
+
+    Пользователь берется из user_cache, который сбрасывается при
+    сохранении и удалении пользователя в этом процессе. Изменения из
+    других процессов видны не позже JWT_USER_CACHE_TIMEOUT секунд,
+    поэтому перед сохранением пользователь перечитывается из БД.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        user = None if user_id is None else user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user)
+        elif not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
@@ -0,0 +1,86 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from titles.models import ResourceVersion
+
+
+def get_response_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_response_key(resource, request, version):
+    """Ключ ответа: версия ресурса, адрес с параметрами и Accept.
+
+    Версия из ResourceVersion общая для всех процессов: после записи в
+    любом из них старые ответы больше не находятся.
+    """
+    representation = '|'.join((
+        request.get_host(),
+        request.get_full_path(),
+        request.headers.get('Accept', ''),
+    ))
+    digest = hashlib.md5(representation.encode('utf-8')).hexdigest()
+    return f'api:{resource}:{version}:{digest}'
+
+
+def get_fragment_keys(resource, rows, version):
+    """Ключи представлений объектов.
+
+    rows — пары (id, версия объекта), version — версия зависимостей,
+    общих для всех объектов.
+    """
+    return {
+        row: f'api:{resource}:fragment:{version}:{row[0]}:{row[1]}'
+        for row in rows
+    }
+
+
+def get_fragments(resource, rows, version):
+    """Закэшированные представления объектов: словарь {строка: данные}."""
+    keys = get_fragment_keys(resource, rows, version)
+    cached = get_response_cache().get_many(keys.values())
+    return {row: cached[key] for row, key in keys.items() if key in cached}
+
+
+def set_fragments(resource, fragments, version):
+    keys = get_fragment_keys(resource, fragments, version)
+    get_response_cache().set_many(
+        {keys[row]: data for row, data in fragments.items()},
+        settings.API_CACHE_TIMEOUT,
+    )
+
+
+class SlugMap:
+    """Процессный кэш соответствия слаг → id для модели со слагом.
+
+    Карта сбрасывается, когда меняется версия ресурса в ResourceVersion.
+    Счетчик хранится в БД, поэтому записи в других процессах тоже ее
+    инвалидируют.
+    """
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        self.clear()
+
+    def clear(self):
+        self.state = (None, {})
+
+    def resolve(self, slugs):
+        """Словарь {слаг: id} существующих слагов, промахи одним IN."""
+        version = ResourceVersion.objects.get_versions(
+            [self.resource]
+        )[self.resource]
+        cached_version, ids = self.state
+        if cached_version != version:
+            ids = {}
+            self.state = (version, ids)
+        missing = {slug for slug in slugs if slug not in ids}
+        if missing:
+            ids.update(
+                self.model.objects.filter(slug__in=missing)
+                .values_list('slug', 'pk')
+            )
+        return {slug: ids[slug] for slug in slugs if slug in ids}
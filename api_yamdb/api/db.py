@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Применяет SQLITE_PRAGMAS к каждому новому соединению SQLite.
+
+    Прагмы выполняются на соединении sqlite3 напрямую, мимо журнала
+    запросов Django.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,77 @@
+from django.utils.encoding import smart_str
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from titles.models import Category, Genre, ResourceVersion
+from .cache import SlugMap
+
+SLUG_MAPS = {
+    Category: SlugMap(Category, ResourceVersion.CATEGORIES),
+    Genre: SlugMap(Genre, ResourceVersion.GENRES),
+}
+
+
+class CachedSlugManyRelatedField(serializers.ManyRelatedField):
+    """Список слагов, определяемый одним обращением к карте слагов."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_instances(data)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Поле по слагу, определяющее id по процессной карте SLUG_MAPS.
+
+    Возвращает экземпляры только с id и слагом: этого достаточно для
+    записи связей. Ограничения queryset поля не учитываются.
+    """
+
+    def __init__(self, slug_field='slug', **kwargs):
+        super().__init__(slug_field=slug_field, **kwargs)
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return CachedSlugManyRelatedField(**list_kwargs)
+
+    def to_internal_value(self, data):
+        return self.to_instances([data])[0]
+
+    def reload(self, instances):
+        """Заново определяет id экземпляров по сброшенной карте слагов.
+
+        Нужен, когда карта устарела: слаг удален или пересоздан мимо
+        сигналов, и запись связи нарушила внешний ключ.
+        """
+        SLUG_MAPS[self.get_queryset().model].clear()
+        return self.to_instances([
+            getattr(instance, self.slug_field) for instance in instances
+        ])
+
+    def to_instances(self, data):
+        queryset = self.get_queryset()
+        model = queryset.model
+        slugs = []
+        for value in data:
+            if not isinstance(value, (str, int)) or isinstance(value, bool):
+                self.fail('invalid')
+            slugs.append(smart_str(value))
+        ids = SLUG_MAPS[model].resolve(slugs)
+        for slug in slugs:
+            if slug not in ids:
+                self.fail(
+                    'does_not_exist', slug_name=self.slug_field, value=slug
+                )
+        instances = []
+        for slug in slugs:
+            instance = model(pk=ids[slug], **{self.slug_field: slug})
+            instance._state.adding = False
+            instance._state.db = queryset.db
+            instances.append(instance)
+        return instances
@@ -1,16 +1,47 @@
 import django_filters
+from rest_framework.filters import SearchFilter
 
-from titles.models import Title
+from titles.models import Category, GenreTitle, Title
+from titles.search import (
+    build_match_query,
+    is_search_available,
+    search_queryset,
+)
 
 
 class TitleFilters(django_filters.FilterSet):
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-    )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-    )
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
 
     class Meta:
         model = Title
         fields = ('category', 'genre', 'name', 'year')
+
+    def filter_category(self, queryset, name, value):
+        """Фильтр по слагу категории подзапросом вместо JOIN."""
+        return queryset.filter(category__in=Category.objects.filter(
+            slug=value
+        ).values('pk'))
+
+    def filter_genre(self, queryset, name, value):
+        """Фильтр по слагу жанра полусоединением: строки не размножаются."""
+        return queryset.filter(pk__in=GenreTitle.objects.filter(
+            genre__slug=value
+        ).values('title_id'))
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Поиск по индексу FTS5 с сортировкой по релевантности.
+
+    Без SQLite работает как обычный SearchFilter по search_fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_search_available():
+            return super().filter_queryset(request, queryset, view)
+        match = build_match_query(
+            request.query_params.get(self.search_param, '')
+        )
+        if match is None:
+            return queryset
+        return search_queryset(queryset, match)
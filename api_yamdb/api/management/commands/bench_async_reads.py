@@ -0,0 +1,120 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+
+from reviews.models import Review
+from titles.models import Category, Genre, Title
+from users.models import User
+
+PATHS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/?page=2',
+    '/api/v1/genres/',
+    '/api/v1/titles/{title_id}/reviews/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает обработку одновременных GET-запросов к каталогу: '
+        'синхронные вьюсеты в пуле из --threads потоков (как WSGI) и '
+        'асинхронные представления ASGI-приложения. Каждый запрос к БД '
+        'задерживается на --latency мс, данные создаются во временной '
+        'тестовой БД. Асинхронные маршруты включаются на время замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--latency', type=float, default=50)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with override_settings(
+                ASYNC_READ_URLCONF='api_yamdb.async_urls'
+            ):
+                self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self):
+        category = Category.objects.create(name='Фильм', slug='films')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(50)
+        )
+        titles = list(Title.objects.all())
+        for title in titles:
+            title.genre.add(genre)
+        authors = User.objects.bulk_create(
+            User(username=f'author{idx}', email=f'author{idx}@yamdb.fake')
+            for idx in range(20)
+        )
+        authors = list(User.objects.filter(
+            username__in=[author.username for author in authors]
+        ))
+        Review.objects.bulk_create(
+            Review(title=titles[0], author=author, text='Отзыв', score=7)
+            for author in authors
+        )
+        return titles[0].pk
+
+    def add_latency(self, latency):
+        """Задержка каждого запроса к БД во всех потоках."""
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency / 1000)
+            return execute(sql, params, many, context)
+
+        def on_connection(connection, **kwargs):
+            connection.execute_wrappers.append(delay)
+
+        connection_created.connect(on_connection, weak=False)
+        connection.execute_wrappers.append(delay)
+
+    def run(self, options):
+        title_id = self.populate()
+        self.add_latency(options['latency'])
+        paths = [
+            PATHS[idx % len(PATHS)].format(title_id=title_id)
+            for idx in range(options['requests'])
+        ]
+
+        client = Client()
+        started = time.monotonic()
+        with ThreadPoolExecutor(options['threads']) as executor:
+            statuses = list(executor.map(
+                lambda path: client.get(path).status_code, paths
+            ))
+        self.report(
+            f'WSGI, {options["threads"]} потоков', statuses,
+            time.monotonic() - started,
+        )
+
+        async def fetch_all():
+            async_client = AsyncClient()
+            responses = await asyncio.gather(
+                *(async_client.get(path) for path in paths)
+            )
+            return [response.status_code for response in responses]
+
+        started = time.monotonic()
+        statuses = asyncio.run(fetch_all())
+        self.report('ASGI', statuses, time.monotonic() - started)
+
+    def report(self, name, statuses, elapsed):
+        errors = sum(code != 200 for code in statuses)
+        rate = len(statuses) / elapsed if elapsed else len(statuses)
+        self.stdout.write(
+            f'{name:<20}{len(statuses):>8} запросов{errors:>6} ошибок'
+            f'{elapsed:>10.2f} с{rate:>10.0f} запросов/с'
+        )
@@ -0,0 +1,168 @@
+import statistics
+import tempfile
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connection
+from django.test.utils import override_settings
+
+from reviews.models import Review
+from titles.models import Category, Title
+from users.models import User
+
+PRODUCTION_DATABASE = settings.DATABASES['default']
+PROFILES = (
+    (
+        'по умолчанию',
+        {'journal_mode': 'DELETE'},
+        {'CONN_MAX_AGE': 0, 'OPTIONS': {}},
+    ),
+    (
+        'production',
+        settings.SQLITE_PRAGMAS,
+        {
+            'CONN_MAX_AGE': PRODUCTION_DATABASE['CONN_MAX_AGE'],
+            'OPTIONS': PRODUCTION_DATABASE['OPTIONS'],
+        },
+    ),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает файловую SQLite одновременными читателями и писателями '
+        'отзывов и сравнивает настройки SQLite по умолчанию с профилем '
+        'из settings: SQLITE_PRAGMAS, CONN_MAX_AGE и transaction_mode. '
+        'Каждая операция оформлена как отдельный запрос: соединения '
+        'закрываются по правилам CONN_MAX_AGE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--titles', type=int, default=20)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"профиль":<16}{"чтений/с":>10}{"p95 чтения, мс":>16}'
+            f'{"записей/с":>11}{"p95 записи, мс":>16}{"locked":>8}'
+        )
+        for name, pragmas, database in PROFILES:
+            with tempfile.TemporaryDirectory() as directory:
+                with override_settings(SQLITE_PRAGMAS=pragmas):
+                    self.run_profile(
+                        name, Path(directory) / 'bench.sqlite3',
+                        database, options,
+                    )
+
+    def run_profile(self, name, path, database, options):
+        """Замер во временной файловой БД с параметрами database.
+
+        Параметры меняются в общем settings_dict, поэтому действуют на
+        соединения всех потоков.
+        """
+        settings_dict = connection.settings_dict
+        saved = {key: settings_dict[key] for key in ('TEST', *database)}
+        settings_dict['TEST'] = {**saved['TEST'], 'NAME': str(path)}
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        settings_dict.update(database)
+        connection.close()
+        try:
+            title_ids = self.populate(options)
+            result = self.load(title_ids, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            settings_dict.update(saved)
+        self.report(name, result, options['seconds'])
+
+    def populate(self, options):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(options['titles'])
+        )
+        return list(Title.objects.values_list('pk', flat=True))
+
+    def load(self, title_ids, options):
+        self.title_ids = title_ids
+        self.deadline = time.monotonic() + options['seconds']
+        self.lock = threading.Lock()
+        result = {'reads': [], 'writes': [], 'locked': 0}
+        threads = [
+            threading.Thread(
+                target=self.run_worker, args=(self.read, result, 'reads')
+            )
+            for _ in range(options['readers'])
+        ] + [
+            threading.Thread(
+                target=self.run_worker,
+                args=(partial(self.write, number), result, 'writes'),
+            )
+            for number in range(options['writers'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return result
+
+    def run_worker(self, operation, result, kind):
+        """Выполняет операцию до конца замера, каждую как отдельный запрос."""
+        try:
+            step = 0
+            while time.monotonic() < self.deadline:
+                close_old_connections()
+                started = time.perf_counter()
+                try:
+                    operation(step)
+                except OperationalError as error:
+                    if 'locked' not in str(error):
+                        raise
+                    with self.lock:
+                        result['locked'] += 1
+                else:
+                    with self.lock:
+                        result[kind].append(time.perf_counter() - started)
+                close_old_connections()
+                step += 1
+        finally:
+            connection.close()
+
+    def read(self, step):
+        title_id = self.title_ids[step % len(self.title_ids)]
+        reviews = Review.objects.filter(title_id=title_id)
+        reviews.count()
+        list(reviews.select_related('author').order_by('-pub_date')[:10])
+        Title.objects.get(pk=title_id)
+
+    def write(self, number, step):
+        author = User.objects.create(
+            username=f'writer{number}_{step}',
+            email=f'writer{number}_{step}@yamdb.fake',
+        )
+        Review.objects.create(
+            title_id=self.title_ids[step % len(self.title_ids)],
+            author=author,
+            text='Отзыв',
+            score=step % 10 + 1,
+        )
+
+    def report(self, name, result, seconds):
+        def p95(samples):
+            if len(samples) < 2:
+                return 0
+            return statistics.quantiles(samples, n=20)[-1] * 1000
+
+        self.stdout.write(
+            f'{name:<16}{len(result["reads"]) / seconds:>10.0f}'
+            f'{p95(result["reads"]):>16.1f}'
+            f'{len(result["writes"]) / seconds:>11.0f}'
+            f'{p95(result["writes"]):>16.1f}{result["locked"]:>8}'
+        )
@@ -0,0 +1,146 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Avg
+
+from api.filters import TitleFilters
+from api.views import TitleViewSet
+from reviews.models import Review, update_title_rating
+from titles.models import Category, Genre, GenreTitle, Title
+from users.models import User
+
+BATCH_SIZE = 10000
+PAGE_SIZE = 10
+GENRES_COUNT = 20
+CATEGORIES_COUNT = 3
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку списка произведений с фильтрами: прежний '
+        'запрос (JOIN + Avg) и текущий. Данные генерируются во временной '
+        'тестовой БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100000)
+        parser.add_argument('--reviews', type=int, default=5000000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            started = time.monotonic()
+            self.populate(options['titles'], options['reviews'])
+            self.stdout.write(
+                f'Данные созданы за {time.monotonic() - started:.1f} с'
+            )
+            self.run(options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def populate(self, titles_count, reviews_count):
+        rnd = random.Random(0)
+        authors_count = -(-reviews_count // max(titles_count, 1))
+        User.objects.bulk_create(
+            [
+                User(username=f'bench{idx}', email=f'bench{idx}@yamdb.fake')
+                for idx in range(authors_count)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        Category.objects.bulk_create([
+            Category(name=f'c{idx}', slug=f'c{idx}')
+            for idx in range(CATEGORIES_COUNT)
+        ])
+        Genre.objects.bulk_create([
+            Genre(name=f'g{idx}', slug=f'g{idx}')
+            for idx in range(GENRES_COUNT)
+        ])
+        categories = list(Category.objects.values_list('pk', flat=True))
+        genres = list(Genre.objects.values_list('pk', flat=True))
+        authors = list(User.objects.values_list('pk', flat=True))
+        Title.objects.bulk_create(
+            (
+                Title(
+                    name=f'title {idx}',
+                    year=1900 + idx % 120,
+                    description='',
+                    category_id=rnd.choice(categories),
+                )
+                for idx in range(titles_count)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        titles = list(Title.objects.values_list('pk', flat=True))
+        GenreTitle.objects.bulk_create(
+            (
+                GenreTitle(title_id=title_id, genre_id=genre_id)
+                for title_id in titles
+                for genre_id in rnd.sample(genres, rnd.randint(1, 3))
+            ),
+            batch_size=BATCH_SIZE,
+        )
+        reviews = (
+            Review(
+                title_id=titles[idx % len(titles)],
+                author_id=authors[idx // len(titles)],
+                text='bench',
+                score=rnd.randint(1, 10),
+            )
+            for idx in range(reviews_count)
+        )
+        while True:
+            batch = [review for _, review in zip(range(BATCH_SIZE), reviews)]
+            if not batch:
+                break
+            Review.objects.bulk_create(batch)
+        update_title_rating()
+
+    def get_querysets(self, params):
+        legacy = (
+            Title.objects.all()
+            .select_related('category')
+            .prefetch_related('genre')
+            .annotate(avg_rating=Avg('reviews__score'))
+        )
+        if 'genre' in params:
+            legacy = legacy.filter(genre__slug=params['genre'])
+        if 'category' in params:
+            legacy = legacy.filter(category__slug=params['category'])
+        current = TitleFilters(
+            data=params, queryset=TitleViewSet().get_queryset()
+        ).qs
+        return legacy, current
+
+    def measure(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset.count()
+            list(queryset.all()[:PAGE_SIZE])
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), max(timings)
+
+    def run(self, repeat):
+        cases = (
+            ('без фильтра', {}),
+            ('genre', {'genre': 'g0'}),
+            ('category', {'category': 'c0'}),
+            ('genre + category', {'genre': 'g0', 'category': 'c0'}),
+        )
+        self.stdout.write(
+            f'{"запрос":<20}{"было, мс":>20}{"стало, мс":>20}'
+        )
+        for name, params in cases:
+            legacy, current = self.get_querysets(params)
+            before = self.measure(legacy, repeat)
+            after = self.measure(current, repeat)
+            before = f'{before[0]:.1f} (max {before[1]:.0f})'
+            after = f'{after[0]:.1f} (max {after[1]:.0f})'
+            self.stdout.write(f'{name:<20}{before:>20}{after:>20}')
@@ -0,0 +1,109 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.urls import URLResolver, include, path
+from django.urls.resolvers import RegexPattern
+from rest_framework.routers import DefaultRouter
+
+from api import urls
+from api.views import (
+    CategoryViewSet,
+    CommentViewSet,
+    GenreViewSet,
+    ReviewViewSet,
+    TitleViewSet,
+    UserViewSet,
+)
+
+PATHS = (
+    '/api/v1/auth/token/',
+    '/api/v1/categories/',
+    '/api/v1/titles/',
+    '/api/v1/titles/1/',
+    '/api/v1/titles/1/reviews/',
+    '/api/v1/titles/1/reviews/2/',
+    '/api/v1/titles/1/reviews/2/comments/',
+    '/api/v1/titles/1/reviews/2/comments/3/',
+    '/api/v1/users/admin/',
+)
+
+
+def get_legacy_patterns():
+    """Прежняя схема: router_v1 целиком на трех уровнях вложенности."""
+    router = DefaultRouter()
+    router.register('users', UserViewSet, basename='users')
+    router.register('categories', CategoryViewSet, basename='categories')
+    router.register('genres', GenreViewSet, basename='genres')
+    router.register('titles', TitleViewSet, basename='titles')
+    router.register('reviews', ReviewViewSet, basename='reviews')
+    router.register('comments', CommentViewSet, basename='comments')
+    return urls.urlpatterns[:-1] + [
+        path('', include(router.urls)),
+        path('titles/<int:title_id>/', include(router.urls)),
+        path(
+            'titles/<int:title_id>/reviews/<int:review_id>/',
+            include(router.urls),
+        ),
+    ]
+
+
+def get_resolver(api_patterns):
+    return URLResolver(
+        RegexPattern(r'^/'), [path('api/v1/', include(api_patterns))]
+    )
+
+
+def count_patterns(patterns):
+    return sum(
+        count_patterns(pattern.url_patterns)
+        if isinstance(pattern, URLResolver) else 1
+        for pattern in patterns
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время разрешения адресов API: прежняя схема с тройным '
+        'подключением router_v1 и текущая с вложенными маршрутами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000)
+
+    def measure(self, resolver, repeat):
+        """Медиана времени разрешения одного адреса по каждому пути, мкс."""
+        timings = {}
+        for url in PATHS:
+            resolver.resolve(url)
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                resolver.resolve(url)
+                samples.append((time.perf_counter() - started) * 10 ** 6)
+            timings[url] = statistics.median(samples)
+        return timings
+
+    def handle(self, *args, **options):
+        legacy_patterns = get_legacy_patterns()
+        self.stdout.write(
+            f'маршрутов: было {count_patterns(legacy_patterns)}, '
+            f'стало {count_patterns(urls.urlpatterns)}'
+        )
+        before = self.measure(
+            get_resolver(legacy_patterns), options['repeat']
+        )
+        after = self.measure(
+            get_resolver(urls.urlpatterns), options['repeat']
+        )
+        self.stdout.write(
+            f'{"адрес":<45}{"было, мкс":>12}{"стало, мкс":>12}'
+        )
+        for url in PATHS:
+            self.stdout.write(
+                f'{url:<45}{before[url]:>12.1f}{after[url]:>12.1f}'
+            )
+        self.stdout.write(
+            f'{"сумма":<45}{sum(before.values()):>12.1f}'
+            f'{sum(after.values()):>12.1f}'
+        )
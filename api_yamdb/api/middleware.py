@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.deprecation import MiddlewareMixin
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class AsyncReadMiddleware(MiddlewareMixin):
+    """Направляет GET-запросы ASGI-приложения к асинхронным маршрутам.
+
+    Под WSGI и для записи маршруты не меняются. Без ASYNC_READ_URLCONF
+    middleware отключается.
+    """
+
+    def __init__(self, get_response=None):
+        if not settings.ASYNC_READ_URLCONF:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_request(self, request):
+        if (
+            isinstance(request, ASGIRequest)
+            and request.method in READ_METHODS
+        ):
+            request.urlconf = settings.ASYNC_READ_URLCONF
@@ -1,6 +1,19 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from titles.models import ResourceVersion
+from users.models import OutboxEmail
+from .cache import (
+    get_fragments,
+    get_response_cache,
+    get_response_key,
+    set_fragments,
+)
 
 CONFIRMATION_SUBJECT = 'Код подтверждения'
 CONFIRMATION_MESSAGE = 'Ваш код подтверждения: {}'
@@ -11,12 +24,217 @@ class EmailConfirmationMixin:
 
     @staticmethod
     def send_confirmation_code(user):
-        """Формирует и отправляет подтверждение (confirmation_code)."""
+        """Ставит письмо с кодом подтверждения в очередь отправки.
+
+        Письмо сохраняется в текущей транзакции и отправляется командой
+        send_outbox.
+        """
         confirmation_code = default_token_generator.make_token(user)
-        send_mail(
+        OutboxEmail.objects.enqueue(
             CONFIRMATION_SUBJECT,
             CONFIRMATION_MESSAGE.format(confirmation_code),
             settings.SENDER_EMAIL,
-            [user.email],
-            fail_silently=False,
+            user.email,
         )
+
+
+def strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def is_not_modified(request, etag):
+    """Совпадает ли If-None-Match запроса с ETag (слабое сравнение)."""
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match or not etag:
+        return False
+    return if_none_match.strip() == '*' or strip_weak(etag) in map(
+        strip_weak, parse_etags(if_none_match)
+    )
+
+
+def not_modified_response(etag):
+    return Response(
+        status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+    )
+
+
+class VersionedETagListMixin:
+    """Миксин условных GET-запросов списка по версиям ресурсов.
+
+    ETag строится из счетчиков etag_resources. При совпадении
+    If-None-Match ответ 304 отдается без запросов к основным таблицам
+    и без сериализации.
+    """
+
+    etag_resources = ()
+
+    def get_etag(self, request):
+        """ETag по версиям ресурсов; версии сохраняются в resource_versions.
+
+        Версии читаются раньше данных, поэтому ответ не бывает старше
+        своего ETag. Уже прочитанные в этом запросе версии не
+        перечитываются.
+        """
+        versions = getattr(self, 'resource_versions', None) or {}
+        if not set(self.etag_resources) <= versions.keys():
+            versions = ResourceVersion.objects.get_versions(
+                self.etag_resources
+            )
+            self.resource_versions = versions
+        representation = '|'.join((
+            request.get_full_path(),
+            request.headers.get('Accept', ''),
+            *(f'{name}:{versions[name]}' for name in self.etag_resources),
+        ))
+        digest = hashlib.md5(representation.encode('utf-8')).hexdigest()
+        return f'W/"{digest}"'
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class VersionedETagMixin(VersionedETagListMixin):
+    """То же для списка и отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ResponseCacheMixin:
+    """Миксин кэширования ответов списка в кэше Django.
+
+    Ключ зависит от параметров запроса (page, search и др.) и версии
+    ресурса cache_resource в ResourceVersion. Закэшированный ответ
+    отдается вместе с ETag, из БД читается только версия.
+    """
+
+    cache_resource = None
+
+    def get_cache_key(self, request):
+        """Ключ ответа; версия читается до данных и попадает в ETag."""
+        versions = ResourceVersion.objects.get_versions([self.cache_resource])
+        self.resource_versions = versions
+        return get_response_key(
+            self.cache_resource, request, versions[self.cache_resource]
+        )
+
+    def get_cached_response(self, key, request):
+        """Ответ из кэша по ключу или None."""
+        cached = get_response_cache().get(key)
+        if cached is None:
+            return None
+        data, etag = cached
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+        response = Response(data)
+        if etag:
+            response['ETag'] = etag
+        return response
+
+    def cache_response(self, key, response):
+        if response.status_code == status.HTTP_200_OK:
+            get_response_cache().set(
+                key,
+                (response.data, response.get('ETag')),
+                settings.API_CACHE_TIMEOUT,
+            )
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        response = self.get_cached_response(key, request)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+            self.cache_response(key, response)
+        return response
+
+
+class FragmentCacheMixin:
+    """Миксин сборки ответов из закэшированных представлений объектов.
+
+    Из БД читаются только id и версии объектов страницы, отсутствующие в
+    кэше объекты сериализуются одним запросом. Ключ представления
+    содержит версию объекта из поля fragment_version_field и версии
+    fragment_dependencies в ResourceVersion: запись объекта сбрасывает
+    только его представление, запись зависимости — все.
+    """
+
+    fragment_resource = None
+    fragment_dependencies = ()
+    fragment_version_field = 'version'
+
+    def get_fragment_version(self):
+        """Версии fragment_dependencies, прочитанные до данных.
+
+        Если ETag уже посчитан, берутся версии из него.
+        """
+        versions = getattr(self, 'resource_versions', None) or {}
+        if not set(self.fragment_dependencies) <= versions.keys():
+            versions = ResourceVersion.objects.get_versions(
+                self.fragment_dependencies
+            )
+        return '.'.join(
+            str(versions[name]) for name in self.fragment_dependencies
+        )
+
+    def get_fragment_rows(self, queryset):
+        """Пары (id, версия) объектов queryset."""
+        return queryset.prefetch_related(None).values_list(
+            'pk', self.fragment_version_field
+        )
+
+    def get_rendered(self, rows):
+        """Представления объектов в порядке rows."""
+        version = self.get_fragment_version()
+        fragments = get_fragments(self.fragment_resource, rows, version)
+        missing = [row for row in rows if row not in fragments]
+        if missing:
+            objects = self.get_queryset().in_bulk(
+                [pk for pk, _ in missing]
+            )
+            found = [row for row in missing if row[0] in objects]
+            rendered = dict(zip(found, self.get_serializer(
+                [objects[pk] for pk, _ in found], many=True
+            ).data))
+            set_fragments(self.fragment_resource, rendered, version)
+            fragments.update(rendered)
+        return [fragments[row] for row in rows if row in fragments]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_fragment_rows(queryset)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(self.get_rendered(list(rows)))
+        return self.get_paginated_response(self.get_rendered(list(page)))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.render_object())
+
+    def render_object(self):
+        """Представление объекта из кэша или из БД.
+
+        Объект читается всегда: get_object() применяет фильтры и
+        проверки доступа. Из кэша экономится только сериализация.
+        """
+        version = self.get_fragment_version()
+        instance = self.get_object()
+        row = (instance.pk, getattr(instance, self.fragment_version_field))
+        fragments = get_fragments(self.fragment_resource, [row], version)
+        if row in fragments:
+            return fragments[row]
+        data = self.get_serializer(instance).data
+        set_fragments(self.fragment_resource, {row: data}, version)
+        return data
@@ -1,10 +1,250 @@
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from urllib import parse
+
 from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ResourcePagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы, выбираемым клиентом.
+
+    Размер задается параметром `page_size`, но не больше max_page_size.
+    Без подсчета (with_count = False или `?count=false`) COUNT не
+    выполняется: выбирается на одну запись больше страницы, в ответе нет
+    ключа `count`. page_size и max_page_size задает класс ресурса.
+    """
+
+    page_size_query_param = 'page_size'
+    with_count = True
+    count_query_param = 'count'
+
+    def get_with_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return self.with_count
+        return value.lower() not in ('0', 'false', 'no')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.counted = self.get_with_count(request)
+        if self.counted:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.page_number = int(page_number)
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        if not results and self.page_number != 1:
+            raise NotFound(self.invalid_page_message)
+        self.has_next = len(results) > page_size
+        return results[:page_size]
+
+    def set_page(self, request, page):
+        """Запоминает страницу с подсчетом, выбранную без paginate_queryset.
+
+        Нужно асинхронным представлениям, которые выполняют COUNT и
+        выборку страницы параллельно.
+        """
+        self.counted = True
+        self.request = request
+        self.page = page
+
+    def get_paginated_response(self, data):
+        if self.counted:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
 
+    def get_next_link(self):
+        if self.counted:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.page_query_param,
+            self.page_number + 1,
+        )
 
-class UserPagination(PageNumberPagination):
+    def get_previous_link(self):
+        if self.counted:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.page_query_param, self.page_number - 1
+        )
+
+
+class UserPagination(ResourcePagination):
     """Пагинация для UserViewSet."""
 
     page_size = settings.POST_PER_PAGE
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class CategoryPagination(ResourcePagination):
+    """Пагинация категорий.
+
+    Справочник небольшой и отдается из кэша, поэтому его можно получить
+    целиком одной страницей.
+    """
+
+    page_size = settings.POST_PER_PAGE
+    max_page_size = settings.MAX_DICTIONARY_PAGE_SIZE
+
+
+class GenrePagination(ResourcePagination):
+    """Пагинация жанров, как у категорий."""
+
+    page_size = settings.POST_PER_PAGE
+    max_page_size = settings.MAX_DICTIONARY_PAGE_SIZE
+
+
+class TitlePagination(ResourcePagination):
+    """Пагинация произведений."""
+
+    page_size = settings.POST_PER_PAGE
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class PubDatePagination(ResourcePagination):
+    """Пагинация отзывов и комментариев.
+
+    По умолчанию работает постранично. Если в запросе передан параметр
+    `cursor` (для первой страницы — пустой), переключается на keyset-пагинацию
+    по паре (pub_date, id): без COUNT и OFFSET, со стабильными ссылками
+    при добавлении новых записей.
+    """
+
+    page_size = settings.POST_PER_PAGE
+    max_page_size = settings.MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Некорректный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.position, self.reverse = self.decode_cursor(request)
+
+        if self.reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+        else:
+            queryset = queryset.order_by('-pub_date', '-id')
+        if self.position is not None:
+            queryset = queryset.filter(self.get_seek_filter())
+
+        results = list(queryset[:page_size + 1])
+        self.has_more = len(results) > page_size
+        results = results[:page_size]
+        if self.reverse:
+            results.reverse()
+        self.page = results
+        return results
+
+    def set_page(self, request, page):
+        self.cursor_mode = False
+        super().set_page(request, page)
+
+    def get_seek_filter(self):
+        """Условие для выборки записей после текущей позиции курсора."""
+        pub_date, pk = self.position
+        if self.reverse:
+            return Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+        return Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if self.reverse:
+            if self.page:
+                return self.encode_cursor(self.page[-1], reverse=False)
+            return self.encode_position(self.position, reverse=False)
+        if self.has_more:
+            return self.encode_cursor(self.page[-1], reverse=False)
+        return None
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if self.reverse:
+            if self.has_more:
+                return self.encode_cursor(self.page[0], reverse=True)
+            return None
+        if self.position is None:
+            return None
+        if self.page:
+            return self.encode_cursor(self.page[0], reverse=True)
+        return self.encode_position(self.position, reverse=True)
+
+    def encode_cursor(self, obj, reverse):
+        return self.encode_position((obj.pub_date, obj.pk), reverse)
+
+    def encode_position(self, position, reverse):
+        """Формирует ссылку с непрозрачным курсором для позиции."""
+        if position is None:
+            return None
+        pub_date, pk = position
+        querystring = parse.urlencode({
+            'p': pub_date.isoformat(),
+            'i': pk,
+            'r': int(reverse),
+        })
+        cursor = b64encode(querystring.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, cursor
+        )
+
+    def decode_cursor(self, request):
+        """Возвращает позицию (pub_date, id) и направление из курсора."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            pub_date = parse_datetime(tokens['p'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (
+            BinasciiError, KeyError, TypeError, UnicodeError, ValueError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (pub_date, pk), reverse
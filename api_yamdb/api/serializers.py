@@ -1,10 +1,12 @@
 import re
 
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
 from reviews.models import Comment, Review
 from titles.models import Category, Genre, Title
 from users.models import User
+from .fields import CachedSlugRelatedField
 
 MAX_EMAIL_LENGTH = 254
 MAX_USERNAME_LENGTH = 150
@@ -84,7 +86,7 @@ class TitleGetSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'reviews_count', 'version')
 
     def get_rating(self, obj):
         return obj.rating
@@ -93,16 +95,51 @@ class TitleGetSerializer(serializers.ModelSerializer):
 class TitlePostPatchSerializer(serializers.ModelSerializer):
     """Сериализатор для добавления и обновления произведений."""
 
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(), slug_field='slug'
-    )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(), slug_field='slug', many=True
-    )
+    category = CachedSlugRelatedField(queryset=Category.objects.all())
+    genre = CachedSlugRelatedField(queryset=Genre.objects.all(), many=True)
 
     class Meta:
         model = Title
-        fields = '__all__'
+        exclude = ('rating_sum', 'reviews_count', 'version')
+
+    def save(self, **kwargs):
+        """Сохраняет произведение и его жанры одной транзакцией.
+
+        Если связь нарушила внешний ключ, карта слагов устарела: слаги
+        определяются заново, удаленные возвращаются ошибкой валидации,
+        а при пересозданных сохранение повторяется один раз.
+        """
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError:
+            if not self.reload_slugs():
+                raise
+        with transaction.atomic():
+            return super().save(**kwargs)
+
+    def reload_slugs(self):
+        """Обновляет id по слагам в validated_data; False, если нечего."""
+        reloaded = False
+        for name, field in self.fields.items():
+            relation = getattr(field, 'child_relation', field)
+            if (
+                not isinstance(relation, CachedSlugRelatedField)
+                or name not in self.validated_data
+            ):
+                continue
+            value = self.validated_data[name]
+            try:
+                instances = relation.reload(
+                    value if isinstance(value, list) else [value]
+                )
+            except serializers.ValidationError as error:
+                raise serializers.ValidationError({name: error.detail})
+            self.validated_data[name] = (
+                instances if isinstance(value, list) else instances[0]
+            )
+            reloaded = True
+        return reloaded
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -117,6 +154,14 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
 
 
+class ReviewSearchSerializer(ReviewSerializer):
+    """Сериализатор отзыва в результатах поиска."""
+
+    class Meta(ReviewSerializer.Meta):
+        exclude = None
+        fields = ('id', 'title', 'text', 'author', 'score', 'pub_date')
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Сериализатор для комментария."""
 
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+from .authentication import user_cache
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """Роль и флаги пользователя должны сразу действовать в этом процессе."""
+    user_cache.delete(instance.pk)
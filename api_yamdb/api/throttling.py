@@ -0,0 +1,264 @@
+"""Ограничение частоты запросов к регистрации и получению токена.
+
+Счетчики скользящего окна: на ключ хранятся только число запросов в
+текущем и предыдущем окне, оценка `предыдущее * (1 - доля прошедшего
+окна) + текущее` считается за O(1). Хранилище выбирается настройкой
+THROTTLE_BACKEND: словарь процесса или кэш Django, общий для процессов.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+class LocMemThrottleBackend:
+    """Счетчики в памяти процесса.
+
+    Хранится не больше max_keys ключей, давно не обновлявшиеся
+    вытесняются первыми.
+    """
+
+    def __init__(self, max_keys=None):
+        self.max_keys = max_keys or settings.THROTTLE_LOCMEM_MAX_KEYS
+        self.counters = OrderedDict()
+        self.lock = threading.Lock()
+
+    def roll(self, key, window):
+        """Счетчики ключа [окно, текущее, предыдущее] на окно window."""
+        counter = self.counters.get(key)
+        if counter is None or counter[0] < window - 1:
+            return [window, 0, 0]
+        if counter[0] == window - 1:
+            return [window, 0, counter[1]]
+        return counter
+
+    def acquire(self, limits):
+        """Учитывает запрос во всех окнах limits или ни в одном.
+
+        limits — кортежи (ключ, окно, длительность, allowed); запрос
+        учитывается, если каждая allowed(предыдущее, текущее) разрешает.
+        Проверка и увеличение выполняются под одной блокировкой.
+        Возвращает решение и счетчики окон с учетом этого запроса.
+        """
+        with self.lock:
+            counters = [self.roll(key, window) for key, window, _, _ in limits]
+            results = [(counter[2], counter[1] + 1) for counter in counters]
+            if not all(
+                allowed(*result)
+                for (_, _, _, allowed), result in zip(limits, results)
+            ):
+                return False, results
+            for (key, _, _, _), counter in zip(limits, counters):
+                counter[1] += 1
+                self.counters[key] = counter
+                self.counters.move_to_end(key)
+            while len(self.counters) > self.max_keys:
+                self.counters.popitem(last=False)
+        return True, results
+
+    def clear(self):
+        with self.lock:
+            self.counters.clear()
+
+
+class CacheThrottleBackend:
+    """Счетчики в кэше THROTTLE_CACHE_ALIAS, общие для всех процессов.
+
+    На окно заводится свой ключ, он живет два окна. Увеличение идет
+    через атомарный incr кэша.
+    """
+
+    def get_cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    @staticmethod
+    def get_window_key(key, window):
+        return f'{key}:{window}'
+
+    def acquire(self, limits):
+        """Сначала атомарно увеличивает счетчики окон, потом проверяет.
+
+        Одновременные запросы получают разные значения счетчика, поэтому
+        лимит не превышается. Если хоть одно окно отклоняет запрос, он
+        вычитается обратно из всех.
+        """
+        cache = self.get_cache()
+        results = []
+        for key, window, duration, _ in limits:
+            window_key = self.get_window_key(key, window)
+            cache.add(window_key, 0, timeout=2 * duration)
+            try:
+                current = cache.incr(window_key)
+            except ValueError:
+                cache.set(window_key, 1, timeout=2 * duration)
+                current = 1
+            previous = cache.get(self.get_window_key(key, window - 1), 0)
+            results.append((previous, current))
+        if all(
+            allowed(*result)
+            for (_, _, _, allowed), result in zip(limits, results)
+        ):
+            return True, results
+        for key, window, _, _ in limits:
+            try:
+                cache.decr(self.get_window_key(key, window))
+            except ValueError:
+                pass
+        return False, results
+
+    def clear(self):
+        """Счетчики удаляются вместе с остальным содержимым кэша."""
+
+
+throttle_backend = import_string(settings.THROTTLE_BACKEND)()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение по скользящему окну с частотой из DEFAULT_THROTTLE_RATES.
+
+    Как у ScopedRateThrottle, область берется из атрибута throttle_scope
+    представления и дополняется scope_suffix: `token_ip`,
+    `signup_username`. Отклоненные запросы не учитываются. Решение
+    принимается без обращения к БД.
+
+    Подкласс задает get_ident_value(request): значение, по которому
+    считаются запросы; None — запрос не ограничивать.
+    """
+
+    scope_suffix = None
+    get_ident_value = None
+
+    def __init__(self):
+        self.backend = throttle_backend
+
+    def get_cache_key(self, request, view):
+        if self.get_ident_value is None:
+            return None
+        ident = self.get_ident_value(request)
+        if ident is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def prepare(self, request, view):
+        """Определяет ключ и окно запроса; False — не ограничивать."""
+        view_scope = getattr(view, 'throttle_scope', None)
+        if not view_scope:
+            return False
+        self.scope = f'{view_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return False
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return False
+        window, offset = divmod(self.timer(), self.duration)
+        self.window = int(window)
+        self.elapsed = offset / self.duration
+        return True
+
+    def get_limit(self):
+        """Окно для хранилища: (ключ, окно, длительность, allowed)."""
+        return self.key, self.window, self.duration, self.is_within_limit
+
+    def set_counters(self, previous, current):
+        self.previous = previous
+        self.estimate = self.get_estimate(previous, current)
+
+    def allow_request(self, request, view):
+        if not self.prepare(request, view):
+            return True
+        allowed, [counters] = self.backend.acquire([self.get_limit()])
+        self.set_counters(*counters)
+        return allowed
+
+    def get_estimate(self, previous, current):
+        return previous * (1 - self.elapsed) + current
+
+    def is_within_limit(self, previous, current):
+        """Укладывается ли оценка с учетом этого запроса в лимит."""
+        return self.get_estimate(previous, current) <= self.num_requests
+
+    def wait(self):
+        """Через сколько секунд оценка опустится ниже лимита.
+
+        Если предыдущее окно не успевает «вытечь» до конца текущего,
+        ждать нужно как минимум до следующего окна.
+        """
+        remaining = self.duration * (1 - self.elapsed)
+        excess = self.estimate - self.num_requests
+        if self.previous and excess <= self.previous * (1 - self.elapsed):
+            return excess / self.previous * self.duration
+        return remaining
+
+
+class CombinedThrottle(BaseThrottle):
+    """Несколько ограничений с общим решением.
+
+    DRF проверяет каждое ограничение отдельно, и запрос, отклоненный
+    одним, уже учтен другими. Здесь окна всех throttle_classes
+    проверяются вместе: запрос учитывается во всех или ни в одном.
+    """
+
+    throttle_classes = ()
+
+    def allow_request(self, request, view):
+        self.throttles = [
+            throttle for throttle in (
+                throttle_class() for throttle_class in self.throttle_classes
+            )
+            if throttle.prepare(request, view)
+        ]
+        if not self.throttles:
+            return True
+        allowed, results = throttle_backend.acquire(
+            [throttle.get_limit() for throttle in self.throttles]
+        )
+        for throttle, counters in zip(self.throttles, results):
+            throttle.set_counters(*counters)
+        return allowed
+
+    def wait(self):
+        """Наибольшее ожидание среди превышенных ограничений."""
+        return max(
+            (
+                throttle.wait() for throttle in self.throttles
+                if throttle.estimate > throttle.num_requests
+            ),
+            default=None,
+        )
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Ограничение по IP-адресу клиента с учетом NUM_PROXIES."""
+
+    scope_suffix = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(SlidingWindowThrottle):
+    """Ограничение по имени пользователя из тела запроса."""
+
+    scope_suffix = 'username'
+
+    def get_ident_value(self, request):
+        """Хэш имени: в ключе кэша не должно быть произвольных символов."""
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return hashlib.md5(
+            username.strip().lower().encode('utf-8')
+        ).hexdigest()
+
+
+class AuthThrottle(CombinedThrottle):
+    """Ограничения регистрации и получения токена: по IP и по username."""
+
+    throttle_classes = (IPThrottle, UsernameThrottle)
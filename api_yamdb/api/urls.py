@@ -6,6 +6,7 @@ from .views import (
     CommentViewSet,
     GenreViewSet,
     ReviewViewSet,
+    SearchViewSet,
     SignupViewSet,
     TitleViewSet,
     TokenViewSet,
@@ -18,22 +19,24 @@ router_v1.register('users', UserViewSet, basename='users')
 router_v1.register('categories', CategoryViewSet, basename='categories')
 router_v1.register('genres', GenreViewSet, basename='genres')
 router_v1.register('titles', TitleViewSet, basename='titles')
-router_v1.register('reviews', ReviewViewSet, basename='reviews')
-router_v1.register('comments', CommentViewSet, basename='comments')
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews', ReviewViewSet, basename='reviews'
+)
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
+    CommentViewSet,
+    basename='comments',
+)
 
 
 urlpatterns = [
     path('auth/signup/', SignupViewSet.as_view(), name='signup'),
     path('auth/token/', TokenViewSet.as_view(), name='token'),
+    path('search/', SearchViewSet.as_view(), name='search'),
     path(
         'users/me/',
         UserViewSet.as_view({'get': 'me', 'patch': 'me', 'delete': 'me'}),
         name='user-me',
     ),
     path('', include(router_v1.urls)),
-    path('titles/<int:title_id>/', include(router_v1.urls)),
-    path(
-        'titles/<int:title_id>/reviews/<int:review_id>/',
-        include(router_v1.urls),
-    ),
 ]
@@ -1,28 +1,41 @@
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, views, viewsets
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from api.filters import TitleFilters
-from reviews.models import Review
-from titles.models import Category, Genre, Title
+from api.filters import FullTextSearchFilter, TitleFilters
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, ResourceVersion, Title
+from titles.search import build_match_query, is_search_available, search_ids
 from users.models import User
-from .mixins import EmailConfirmationMixin
-from .pagination import UserPagination
+from .mixins import (
+    EmailConfirmationMixin,
+    FragmentCacheMixin,
+    ResponseCacheMixin,
+    VersionedETagListMixin,
+    VersionedETagMixin,
+)
+from .pagination import (
+    CategoryPagination,
+    GenrePagination,
+    PubDatePagination,
+    TitlePagination,
+    UserPagination,
+)
 from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrReadOnly
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
     GenreSerializer,
+    ReviewSearchSerializer,
     ReviewSerializer,
     SignupSerializer,
     TitleGetSerializer,
@@ -30,11 +43,16 @@ from .serializers import (
     TokenSerializer,
     UserSerializer,
 )
+from .throttling import AuthThrottle
 
 
 class SignupViewSet(EmailConfirmationMixin, views.APIView):
     """Класс для регистрации пользователя."""
 
+    authentication_classes = ()
+    throttle_classes = (AuthThrottle,)
+    throttle_scope = 'signup'
+
     def post(self, request):
         """Обрабатывает регистрацию."""
         serializer = SignupSerializer(data=request.data)
@@ -49,21 +67,16 @@ class SignupViewSet(EmailConfirmationMixin, views.APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        user, created = self._get_or_create_user(username, email)
+        with transaction.atomic():
+            user, created = self._get_or_create_user(username, email)
 
-        if not created and user.email != email:
-            return Response(
-                {'username': 'Пользователь с таким ником уже существует'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+            if not created and user.email != email:
+                return Response(
+                    {'username': 'Пользователь с таким ником уже существует'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        try:
             self.send_confirmation_code(user)
-        except Exception:
-            return Response(
-                {'error': 'Ошибка при отправке кода подтверждения'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
 
         return self._prepare_response(created, serializer)
 
@@ -91,6 +104,10 @@ class SignupViewSet(EmailConfirmationMixin, views.APIView):
 class TokenViewSet(views.APIView):
     """Класс для получения токена."""
 
+    authentication_classes = ()
+    throttle_classes = (AuthThrottle,)
+    throttle_scope = 'token'
+
     def post(self, request):
         """Обрабатывает получение токена."""
         serializer = TokenSerializer(data=request.data)
@@ -123,6 +140,26 @@ class UserViewSet(EmailConfirmationMixin, viewsets.ModelViewSet):
     filter_backends = [SearchFilter]
     search_fields = ['username']
     http_method_names = ['get', 'post', 'patch', 'delete']
+    prefix_param = 'prefix'
+    autocomplete_limit = 10
+    max_autocomplete_limit = 50
+
+    def list(self, request, *args, **kwargs):
+        """Список пользователей или автодополнение по ?prefix=."""
+        prefix = request.query_params.get(self.prefix_param)
+        if prefix is None:
+            return super().list(request, *args, **kwargs)
+        users = User.objects.autocomplete(
+            prefix, self.get_autocomplete_limit(request)
+        )
+        return Response(self.get_serializer(users, many=True).data)
+
+    def get_autocomplete_limit(self, request):
+        try:
+            limit = int(request.query_params['limit'])
+        except (KeyError, ValueError):
+            return self.autocomplete_limit
+        return min(max(limit, 1), self.max_autocomplete_limit)
 
     def get_permissions(self):
         if self.action == 'me':
@@ -137,8 +174,11 @@ class UserViewSet(EmailConfirmationMixin, viewsets.ModelViewSet):
             return Response(user_data)
 
         if request.method == 'PATCH':
+            # request.user может быть из кэша аутентификации и отставать
+            # от БД: save() записал бы обратно старые роль и флаги.
+            user = get_object_or_404(User, pk=request.user.pk)
             serializer = self.get_serializer(
-                request.user, data=request.data, partial=True
+                user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
@@ -147,6 +187,7 @@ class UserViewSet(EmailConfirmationMixin, viewsets.ModelViewSet):
         if request.method == 'DELETE':
             return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         user = serializer.save()
         user_not_authenticated = not self.request.user.is_authenticated
@@ -157,6 +198,8 @@ class UserViewSet(EmailConfirmationMixin, viewsets.ModelViewSet):
 
 
 class CategoryViewSet(
+    ResponseCacheMixin,
+    VersionedETagListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -167,13 +210,17 @@ class CategoryViewSet(
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [IsAdminOrReadOnly]
-    pagination_class = PageNumberPagination
+    pagination_class = CategoryPagination
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ['name']
     lookup_field = 'slug'
+    etag_resources = (ResourceVersion.CATEGORIES,)
+    cache_resource = ResourceVersion.CATEGORIES
 
 
 class GenreViewSet(
+    ResponseCacheMixin,
+    VersionedETagListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -184,27 +231,41 @@ class GenreViewSet(
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = [IsAdminOrReadOnly]
-    pagination_class = PageNumberPagination
+    pagination_class = GenrePagination
     filter_backends = (DjangoFilterBackend, SearchFilter)
     search_fields = ['name']
     lookup_field = 'slug'
+    etag_resources = (ResourceVersion.GENRES,)
+    cache_resource = ResourceVersion.GENRES
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    VersionedETagMixin, FragmentCacheMixin, viewsets.ModelViewSet
+):
     """Получение списка всех произведений"""
 
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = (DjangoFilterBackend, SearchFilter)
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter)
     filterset_class = TitleFilters
-    pagination_class = PageNumberPagination
+    search_fields = ('name', 'description')
+    pagination_class = TitlePagination
     http_method_names = ['get', 'post', 'delete', 'patch']
+    etag_resources = (
+        ResourceVersion.TITLES,
+        ResourceVersion.CATEGORIES,
+        ResourceVersion.GENRES,
+    )
+    fragment_resource = ResourceVersion.TITLES
+    fragment_dependencies = (
+        ResourceVersion.CATEGORIES,
+        ResourceVersion.GENRES,
+    )
 
     def get_queryset(self):
         return (
             Title.objects.all()
             .select_related('category')
             .prefetch_related('genre')
-            .annotate(rating=Avg('reviews__score'))
         )
 
     def get_serializer_class(self):
@@ -213,13 +274,58 @@ class TitleViewSet(viewsets.ModelViewSet):
         return TitleGetSerializer
 
 
-class BaseViewSet(viewsets.ModelViewSet):
-    """Базовый вьюсет для отзывов и комментариев."""
+class SearchViewSet(views.APIView):
+    """Полнотекстовый поиск по произведениям и отзывам."""
+
+    results_limit = 10
+
+    def get(self, request):
+        """Лучшие по релевантности произведения и отзывы."""
+        text = request.query_params.get('search', '')
+        match = build_match_query(text)
+        if match is None:
+            return Response(
+                {'search': 'Укажите строку поиска'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        )
+        reviews = Review.objects.select_related('author')
+        return Response({
+            'titles': TitleGetSerializer(
+                self.find(titles, text, match, ('name', 'description')),
+                many=True,
+            ).data,
+            'reviews': ReviewSearchSerializer(
+                self.find(reviews, text, match, ('text',)), many=True
+            ).data,
+        })
+
+    def find(self, queryset, text, match, fields):
+        """Первые results_limit совпадений в порядке релевантности."""
+        if not is_search_available():
+            query = Q()
+            for field in fields:
+                query |= Q(**{f'{field}__icontains': text})
+            return queryset.filter(query)[:self.results_limit]
+        ids = search_ids(queryset.model, match, self.results_limit)
+        objects = queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+
+class BaseViewSet(VersionedETagMixin, viewsets.ModelViewSet):
+    """Базовый вьюсет для отзывов и комментариев.
+
+    Родитель задается моделью parent_model, полем parent_field дочерней
+    модели и словарем parent_lookups {поле родителя: параметр маршрута}.
+    """
 
-    pagination_class = PageNumberPagination
-    pagination_class.page_size = settings.POST_PER_PAGE
     permission_classes = (IsAuthorOrReadOnly,)
     http_method_names = ['patch', 'get', 'post', 'delete']
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
 
     def get_permissions(self):
         """Доступ к отдельному объекту при GET-запросе."""
@@ -227,45 +333,88 @@ class BaseViewSet(viewsets.ModelViewSet):
             return (IsAdminOrReadOnly(),)
         return super().get_permissions()
 
+    def get_parent_filter(self):
+        """Условия поиска родительского объекта по параметрам маршрута."""
+        return {
+            lookup: self.kwargs[kwarg]
+            for lookup, kwarg in self.parent_lookups.items()
+        }
+
+    def get_objects_filter(self):
+        """Те же условия для дочерних объектов, через parent_field."""
+        return {
+            f'{self.parent_field}__{lookup}': value
+            for lookup, value in self.get_parent_filter().items()
+        }
+
+    def get_parent(self):
+        """Родительский объект маршрута.
+
+        Загружается только id, один раз за запрос; при отсутствии — 404.
+        """
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model.objects.only('pk'),
+                **self.get_parent_filter(),
+            )
+        return self._parent
+
+    def get_children(self):
+        """Объекты родителя без проверки самого родителя."""
+        return self.queryset.filter(
+            **self.get_objects_filter()
+        ).select_related('author')
 
-def get_review(self):
-    return get_object_or_404(
-        Review,
-        title=self.kwargs['title_id'],
-        id=self.kwargs['review_id'],
-    )
+    def get_queryset(self):
+        """Объекты родителя; для списка родитель проверяется отдельно."""
+        if self.action == 'list':
+            self.get_parent()
+        return self.get_children()
+
+    def perform_create(self, serializer):
+        serializer.save(
+            author=self.request.user,
+            **{self.parent_field: self.get_parent()},
+        )
 
 
 class ReviewViewSet(BaseViewSet):
     """Класс для отзыва."""
 
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
-
-    def get_queryset(self):
-        """Получение списка отзывов."""
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        return title.reviews.all()
+    pagination_class = PubDatePagination
+    etag_resources = (ResourceVersion.REVIEWS, ResourceVersion.TITLES)
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id'}
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['title_id'])
-        review = Review.objects.filter(title=title, author=self.request.user)
-        if review:
+        """Повторный отзыв отсекает ограничение unique_review в БД.
+
+        Другие нарушения целостности не маскируются: ошибка считается
+        повтором, только если отзыв автора на произведение уже есть.
+        """
+        try:
+            with transaction.atomic():
+                super().perform_create(serializer)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=self.get_parent(), author=self.request.user
+            ).exists():
+                raise
             raise ValidationError(
                 'Вы уже отправляли отзыв на это произведение.'
             )
-        serializer.save(author=self.request.user, title=title)
 
 
 class CommentViewSet(BaseViewSet):
     """Класс для комментария."""
 
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
-
-    def get_queryset(self):
-        """Получение списка комментариев."""
-        review = get_review(self)
-        return review.comments.all()
-
-    def perform_create(self, serializer):
-        review = get_review(self)
-        serializer.save(author=self.request.user, review=review)
+    pagination_class = PubDatePagination
+    etag_resources = (ResourceVersion.COMMENTS, ResourceVersion.REVIEWS)
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
@@ -0,0 +1,12 @@
+"""Маршруты для GET-запросов ASGI-приложения.
+
+Чтение каталога обрабатывают асинхронные представления, все остальное —
+общие маршруты из api_yamdb.urls.
+"""
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/v1/', include('api.async_urls')),
+] + sync_urlpatterns
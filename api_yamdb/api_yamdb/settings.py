@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.AsyncReadMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -37,10 +38,30 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedUserJWTAuthentication',
     ),
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': '30/min',
+        'signup_username': '5/min',
+        'token_ip': '30/min',
+        'token_username': '5/min',
+    },
+    # Число доверенных прокси перед приложением. 0 — клиентом считается
+    # REMOTE_ADDR, X-Forwarded-For игнорируется: иначе клиент подменял бы
+    # свой IP для ограничений. За прокси указать их число.
+    'NUM_PROXIES': 0,
 }
 
+# Хранилище счетчиков ограничения частоты запросов к auth/signup и
+# auth/token. LocMemThrottleBackend считает в памяти процесса; при
+# нескольких процессах нужен CacheThrottleBackend с общим кэшем
+# THROTTLE_CACHE_ALIAS (Memcached, Redis).
+THROTTLE_BACKEND = 'api.throttling.LocMemThrottleBackend'
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_LOCMEM_MAX_KEYS = 100000
+
+JWT_USER_CACHE_TIMEOUT = 60
+
 SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -52,6 +73,14 @@ SIMPLE_JWT = {
 
 ROOT_URLCONF = 'api_yamdb.urls'
 
+# Маршруты GET-запросов под ASGI: чтение каталога без потока на запрос.
+# Выключено: выигрыш есть только при медленной БД, при быстрой асинхронные
+# представления медленнее синхронных. Включается значением
+# 'api_yamdb.async_urls'.
+ASYNC_READ_URLCONF = None
+# Потоки для запросов к БД из асинхронных представлений.
+ASYNC_DB_THREADS = 32
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 TEMPLATES = [
     {
@@ -75,11 +104,38 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'api_yamdb.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение потока переживает запрос, прагмы не повторяются.
+        'CONN_MAX_AGE': 600,
+        'OPTIONS': {
+            # Запись в atomic() ждет busy_timeout, а не падает с
+            # database is locked.
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Прагмы каждого нового соединения SQLite (api/db.py). В режиме WAL
+# чтение не блокируется записью, synchronous=NORMAL в WAL не грозит
+# повреждением БД и убирает fsync на каждый коммит, busy_timeout ждет
+# освобождения блокировки записи вместо ошибки database is locked.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 60 * 5
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -112,5 +168,14 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 SENDER_EMAIL = 'noreply@yamdb.com'
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_FLUSH_INTERVAL = 1
+EMAIL_OUTBOX_POLL_INTERVAL = 1
+EMAIL_OUTBOX_LEASE = 300
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 60 * 60
 
 POST_PER_PAGE = 10
+MAX_PAGE_SIZE = 100
+MAX_DICTIONARY_PAGE_SIZE = 1000
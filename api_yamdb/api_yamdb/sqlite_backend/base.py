@@ -0,0 +1,34 @@
+"""SQLite с настраиваемым началом транзакций.
+
+OPTIONS['transaction_mode'] задает BEGIN DEFERRED, IMMEDIATE или
+EXCLUSIVE, как в Django 5.1. При IMMEDIATE блокировка записи берется
+в начале atomic(), и ожидание busy_timeout работает; отложенная
+транзакция в режиме WAL при повышении до записи сразу получает
+database is locked, если другой процесс успел записать.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('transaction_mode', None)
+        return params
+
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get(
+            'transaction_mode', 'DEFERRED'
+        ).upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'transaction_mode должен быть одним из {TRANSACTION_MODES}.'
+            )
+        return mode
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['review', '-pub_date', '-id'], name='comment_review_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['title', '-pub_date', '-id'], name='review_title_pub_date_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import DEFERRED, Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
 from titles.models import Title
 from users.models import User
 
@@ -35,10 +38,52 @@ class Review(models.Model):
                 name='unique_review'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date', '-id'],
+                name='review_title_pub_date_idx',
+            )
+        ]
 
     def __str__(self):
         return f'{self.text}, {self.title}, {self.author}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает загруженные из БД значения для пересчета рейтинга."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values)
+            if value is not DEFERRED
+        }
+        return instance
+
+    def refresh_loaded_values(self):
+        """Перечитывает сохраненные title_id и score внутри транзакции.
+
+        Значения из from_db прочитаны до транзакции: при одновременных
+        изменениях отзыва рейтинг сдвигался бы от устаревшей оценки.
+        """
+        self._loaded_values = (
+            Review.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values('title_id', 'score')
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        """Сохраняет отзыв и обновляет рейтинг в одной транзакции."""
+        with transaction.atomic():
+            if not self._state.adding:
+                self.refresh_loaded_values()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Удаляет отзыв и вычитает из рейтинга сохраненную оценку."""
+        with transaction.atomic():
+            self.refresh_loaded_values()
+            return super().delete(*args, **kwargs)
+
 
 class Comment(models.Model):
     """Модель комментария к отзыву."""
@@ -63,6 +108,39 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date', '-id'],
+                name='comment_review_pub_date_idx',
+            )
+        ]
 
     def __str__(self):
         return f'{self.text}, {self.review}, {self.author}'
+
+
+def update_title_rating(title_ids=None):
+    """Пересчитывает сохраненный рейтинг произведений по их отзывам."""
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    titles.update(
+        rating_sum=Coalesce(
+            Subquery(
+                reviews.values('title')
+                .annotate(total=Sum('score'))
+                .values('total')
+            ),
+            0,
+        ),
+        reviews_count=Coalesce(
+            Subquery(
+                reviews.values('title')
+                .annotate(total=Count('pk'))
+                .values('total')
+            ),
+            0,
+        ),
+        version=F('version') + 1,
+    )
@@ -0,0 +1,96 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from titles.models import ResourceVersion, Title
+from users.models import User
+from .models import Comment, Review, update_title_rating
+
+RATING_FIELDS = {'title_id', 'score'}
+
+
+def change_title_rating(title_id, score, count):
+    """Атомарно сдвигает сумму оценок и количество отзывов произведения.
+
+    Рейтинг входит в представление произведения, поэтому меняется и его
+    версия.
+    """
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score,
+        reviews_count=F('reviews_count') + count,
+        version=F('version') + 1,
+    )
+
+
+def get_loaded_values(instance):
+    """Значения отзыва на момент загрузки из БД или None."""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None or not RATING_FIELDS <= loaded.keys():
+        return None
+    return loaded
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    """Учитывает новый или измененный отзыв в рейтинге произведения."""
+    if raw:
+        return
+    loaded = get_loaded_values(instance)
+    if created:
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif loaded is None:
+        update_title_rating([instance.title_id])
+    elif loaded['title_id'] != instance.title_id:
+        change_title_rating(loaded['title_id'], -loaded['score'], -1)
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif loaded['score'] != instance.score:
+        change_title_rating(
+            instance.title_id, instance.score - loaded['score'], 0
+        )
+    instance._loaded_values = {
+        'title_id': instance.title_id,
+        'score': instance.score,
+    }
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Убирает удаленный отзыв из рейтинга, в том числе при каскаде."""
+    loaded = get_loaded_values(instance)
+    if loaded is None:
+        update_title_rating([instance.title_id])
+    else:
+        change_title_rating(loaded['title_id'], -loaded['score'], -1)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, raw=False, **kwargs):
+    """Отзывы входят в рейтинг, поэтому меняется и версия произведений.
+
+    Версия произведений нужна для ETag списка; закэшированные
+    представления других произведений остаются действительными.
+    """
+    if not raw:
+        ResourceVersion.objects.bump(
+            ResourceVersion.REVIEWS, ResourceVersion.TITLES
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, raw=False, **kwargs):
+    if not raw:
+        ResourceVersion.objects.bump(ResourceVersion.COMMENTS)
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, created, update_fields=None, raw=False,
+                   **kwargs):
+    """Username автора выводится в отзывах и комментариях."""
+    if raw or created:
+        return
+    if update_fields is None or 'username' in update_fields:
+        ResourceVersion.objects.bump(
+            ResourceVersion.REVIEWS, ResourceVersion.COMMENTS
+        )
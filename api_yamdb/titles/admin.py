@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Genre, Title
+from .models import Category, Genre, GenreTitle, Title
 
 
 class CategoryAdmin(admin.ModelAdmin):
@@ -15,11 +15,17 @@ class GenreAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('name',)}
 
 
+class GenreTitleInline(admin.TabularInline):
+    model = GenreTitle
+    extra = 1
+    autocomplete_fields = ('genre',)
+
+
 class TitleAdmin(admin.ModelAdmin):
     list_display = ('name', 'year', 'category')
     list_filter = ('year', 'category', 'genre')
     search_fields = ('name', 'description')
-    filter_horizontal = ('genre',)
+    inlines = (GenreTitleInline,)
     autocomplete_fields = ('category',)
 
 
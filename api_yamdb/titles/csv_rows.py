@@ -0,0 +1,114 @@
+"""Разбор строк CSV-выгрузки для команды load_data.
+
+Модуль не импортирует модели, поэтому его функции можно выполнять
+в дочерних процессах без настройки Django.
+"""
+import csv
+import hashlib
+import io
+import json
+
+from django.contrib.auth.hashers import make_password
+from django.utils.dateparse import parse_datetime
+
+
+def parse_user(row):
+    return {
+        'id': int(row['id']),
+        'username': row['username'],
+        'email': row['email'],
+        'role': row['role'],
+        'bio': row['bio'],
+        'first_name': row['first_name'],
+        'last_name': row['last_name'],
+        'password': make_password(None),
+        'username_normalized': row['username'].lower(),
+        'email_normalized': row['email'].lower(),
+    }
+
+
+def parse_slug_model(row):
+    return {'id': int(row['id']), 'name': row['name'], 'slug': row['slug']}
+
+
+def parse_title(row):
+    return {
+        'id': int(row['id']),
+        'name': row['name'],
+        'year': int(row['year']),
+        'description': row.get('description', ''),
+        'category_id': int(row['category']) if row['category'] else None,
+    }
+
+
+def parse_genre_title(row):
+    return {
+        'id': int(row['id']),
+        'title_id': int(row['title_id']),
+        'genre_id': int(row['genre_id']),
+    }
+
+
+def parse_review(row):
+    return {
+        'id': int(row['id']),
+        'title_id': int(row['title_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'score': int(row['score']),
+        'pub_date': parse_datetime(row['pub_date']),
+    }
+
+
+def parse_comment(row):
+    return {
+        'id': int(row['id']),
+        'review_id': int(row['review_id']),
+        'text': row['text'],
+        'author_id': int(row['author']),
+        'pub_date': parse_datetime(row['pub_date']),
+    }
+
+
+def row_checksum(row):
+    """Контрольная сумма исходной строки CSV."""
+    data = json.dumps(list(row.values()), ensure_ascii=False)
+    return hashlib.md5(data.encode('utf-8')).hexdigest()
+
+
+def parse_rows(parse, rows, checksum=False):
+    """Пары (значения полей, контрольная сумма или None)."""
+    for row in rows:
+        yield parse(row), row_checksum(row) if checksum else None
+
+
+def split_csv(path, chunk_size):
+    """Делит файл на диапазоны байтов по границам записей.
+
+    Граница ставится только после перевода строки вне кавычек, поэтому
+    многострочные тексты в кавычках не разрываются между частями.
+    Возвращает заголовок и список диапазонов (start, end).
+    """
+    with open(path, 'rb') as csv_file:
+        header = next(csv.reader([csv_file.readline().decode('utf-8')]))
+        start = position = csv_file.tell()
+        quotes = 0
+        ranges = []
+        for line in csv_file:
+            position += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and position - start >= chunk_size:
+                ranges.append((start, position))
+                start = position
+        if position > start:
+            ranges.append((start, position))
+    return header, ranges
+
+
+def parse_chunk(parse, path, fieldnames, start, end, checksum=False):
+    """Разбирает диапазон байтов файла, см. parse_rows."""
+    with open(path, 'rb') as csv_file:
+        csv_file.seek(start)
+        text = csv_file.read(end - start).decode('utf-8')
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames)
+    return list(parse_rows(parse, reader, checksum))
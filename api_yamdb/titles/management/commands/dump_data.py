@@ -0,0 +1,139 @@
+import csv
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, GenreTitle, Title
+from users.models import User
+from .load_data import TABLES
+
+DEFAULT_CHUNK_SIZE = 2000
+FORMATS = ('csv', 'jsonl')
+
+COLUMNS = {
+    User: (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('role', 'role'),
+        ('bio', 'bio'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    ),
+    Category: (('id', 'id'), ('name', 'name'), ('slug', 'slug')),
+    Genre: (('id', 'id'), ('name', 'name'), ('slug', 'slug')),
+    Title: (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('category', 'category_id'),
+        ('description', 'description'),
+    ),
+    GenreTitle: (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('genre_id', 'genre_id'),
+    ),
+    Review: (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    ),
+    Comment: (
+        ('id', 'id'),
+        ('review_id', 'review_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('pub_date', 'pub_date'),
+    ),
+}
+
+
+def format_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает каталог в CSV или JSONL. CSV-выгрузку можно '
+        'загрузить обратно командой load_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', type=Path, help='Каталог для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--format',
+            choices=FORMATS,
+            default='csv',
+            help='Формат файлов выгрузки.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за один раз.',
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.format = options['format']
+        self.chunk_size = options['chunk_size']
+        if self.chunk_size < 1:
+            raise CommandError('--chunk-size должен быть больше нуля.')
+        self.path.mkdir(parents=True, exist_ok=True)
+        for table in TABLES:
+            self.dump_table(table)
+
+    def dump_table(self, table):
+        headers, lookups = zip(*COLUMNS[table.model])
+        rows = (
+            table.model.objects.order_by('pk')
+            .values_list(*lookups)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        filename = Path(table.filename).with_suffix(f'.{self.format}')
+        started = time.monotonic()
+        with open(
+            self.path / filename, 'w', encoding='utf-8', newline=''
+        ) as out:
+            if self.format == 'csv':
+                count = self.write_csv(out, headers, rows)
+            else:
+                count = self.write_jsonl(out, headers, rows)
+        elapsed = time.monotonic() - started
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{filename}: {count} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+
+    def write_csv(self, out, headers, rows):
+        writer = csv.writer(out)
+        writer.writerow(headers)
+        count = 0
+        for row in rows:
+            writer.writerow([format_value(value) for value in row])
+            count += 1
+        return count
+
+    def write_jsonl(self, out, headers, rows):
+        count = 0
+        for row in rows:
+            out.write(json.dumps(
+                dict(zip(headers, map(format_value, row))),
+                ensure_ascii=False,
+            ))
+            out.write('\n')
+            count += 1
+        return count
@@ -0,0 +1,90 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from reviews.models import Comment, Review
+from titles.models import Category, GenreTitle, Title
+from users.models import User
+
+FULL_SCAN_PREFIX = 'SCAN '
+
+
+class Command(BaseCommand):
+    help = 'Печатает EXPLAIN QUERY PLAN для запросов вложенных эндпоинтов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Завершиться с ошибкой, если в плане есть полный скан.',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Команда поддерживает только SQLite.')
+        full_scans = []
+        for name, queryset in self.get_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for detail in self.explain(queryset):
+                if detail.startswith(FULL_SCAN_PREFIX):
+                    full_scans.append(name)
+                    self.stdout.write(self.style.WARNING(f'  {detail}'))
+                else:
+                    self.stdout.write(f'  {detail}')
+        if not full_scans:
+            self.stdout.write(self.style.SUCCESS('Полных сканов нет.'))
+            return
+        message = 'Полные сканы: ' + ', '.join(dict.fromkeys(full_scans))
+        if options['strict']:
+            raise CommandError(message)
+        self.stdout.write(self.style.WARNING(message))
+
+    def get_queries(self):
+        """Запросы эндпоинтов отзывов, комментариев и фильтра по жанру."""
+        title_id = Title.objects.values_list('pk', flat=True).first() or 1
+        review_id = Review.objects.values_list('pk', flat=True).first() or 1
+        author_id = User.objects.values_list('pk', flat=True).first() or 1
+        now = timezone.now()
+        seek = Q(pub_date__lt=now) | Q(pub_date=now, id__lt=review_id)
+        reviews = Review.objects.filter(title_id=title_id)
+        comments = Comment.objects.filter(review_id=review_id)
+        return (
+            ('GET /titles/{title_id}/reviews/', reviews[:10]),
+            ('GET /titles/{title_id}/reviews/ (count)', reviews.order_by()),
+            (
+                'GET /titles/{title_id}/reviews/?cursor=',
+                reviews.filter(seek)
+                .order_by('-pub_date', '-id')[:11],
+            ),
+            (
+                'POST /titles/{title_id}/reviews/ (unique_review)',
+                Review.objects.filter(title_id=title_id, author_id=author_id),
+            ),
+            ('GET /titles/{title_id}/reviews/{review_id}/comments/',
+             comments[:10]),
+            (
+                'GET /titles/{title_id}/reviews/{review_id}/comments/'
+                '?cursor=',
+                comments.filter(seek)
+                .order_by('-pub_date', '-id')[:11],
+            ),
+            (
+                'GET /titles/?genre={slug}',
+                Title.objects.filter(pk__in=GenreTitle.objects.filter(
+                    genre__slug='slug'
+                ).values('title_id')),
+            ),
+            (
+                'GET /titles/?category={slug}',
+                Title.objects.filter(category__in=Category.objects.filter(
+                    slug='slug'
+                ).values('pk')),
+            ),
+        )
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
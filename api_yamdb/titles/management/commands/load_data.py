@@ -1,128 +1,321 @@
 import csv
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
 
-from reviews.models import Comment, Review
-from titles.models import Category, Genre, GenreTitle, Title
+from reviews.models import Comment, Review, update_title_rating
+from titles.csv_rows import (
+    parse_chunk,
+    parse_comment,
+    parse_genre_title,
+    parse_review,
+    parse_rows,
+    parse_slug_model,
+    parse_title,
+    parse_user,
+    split_csv,
+)
+from titles.models import (
+    Category,
+    Genre,
+    GenreTitle,
+    ImportChecksum,
+    ResourceVersion,
+    Title,
+)
 from users.models import User
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_DATA_DIR = Path(settings.BASE_DIR) / 'static' / 'data'
+CREATE_ONLY_FIELDS = {'id', 'password'}
+
+Table = namedtuple('Table', ('model', 'filename', 'parse', 'references'))
+
+TABLES = (
+    Table(User, 'users.csv', parse_user, {}),
+    Table(Category, 'category.csv', parse_slug_model, {}),
+    Table(Genre, 'genre.csv', parse_slug_model, {}),
+    Table(Title, 'titles.csv', parse_title, {'category_id': Category}),
+    Table(
+        GenreTitle,
+        'genre_title.csv',
+        parse_genre_title,
+        {'title_id': Title, 'genre_id': Genre},
+    ),
+    Table(
+        Review,
+        'review.csv',
+        parse_review,
+        {'title_id': Title, 'author_id': User},
+    ),
+    Table(
+        Comment,
+        'comments.csv',
+        parse_comment,
+        {'review_id': Review, 'author_id': User},
+    ),
+)
+
+
+@contextmanager
+def keep_auto_now(model):
+    """Сохраняет даты из CSV вместо подстановки auto_now_add."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов в базу пакетами.'
 
-    def handle(self, *args, **kwargs):
-        self.load_users()
-        self.load_categories()
-        self.load_genres()
-        self.load_titles()
-        self.load_genre_titles()
-        self.load_reviews()
-        self.load_comments()
-
-    def load_users(self):
-        with open('static/data/users.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            n = 0
-            for row in reader:
-                User(
-                    id=row[0],
-                    username=row[1],
-                    email=row[2],
-                    role=row[3],
-                    bio=row[4],
-                    first_name=row[5],
-                    last_name=row[6],
-                ).save()
-                n += 1
-                print(f'done {n}')
-
-    def load_categories(self):
-        with open('static/data/category.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            categories = []
-            for row in reader:
-                categories.append(Category(
-                    name=row[1],
-                    slug=row[2],
-                ))
-            Category.objects.bulk_create(categories)
-            print(f'done {len(categories)}')
-
-    def load_genres(self):
-        with open('static/data/genre.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            genres = []
-            for row in reader:
-                genres.append(Genre(
-                    name=row[1],
-                    slug=row[2],
-                ))
-            Genre.objects.bulk_create(genres)
-            print(f'done {len(genres)}')
-
-    def load_titles(self):
-        with open('static/data/titles.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            titles = []
-            for row in reader:
-                category = Category.objects.get(id=row[3])
-                titles.append(Title(
-                    name=row[1],
-                    year=row[2],
-                    category=category
-                ))
-            Title.objects.bulk_create(titles)
-            print(f'done {len(titles)}')
-
-    def load_genre_titles(self):
-        with open('static/data/genre_title.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            genre_titles = []
-            for row in reader:
-                title_id = Title.objects.get(id=row[1])
-                genre_id = Genre.objects.get(id=row[2])
-                genre_titles.append(GenreTitle(
-                    title=title_id,
-                    genre=genre_id
-                ))
-            GenreTitle.objects.bulk_create(genre_titles)
-            print(f'done {len(genre_titles)}')
-
-    def load_reviews(self):
-        with open('static/data/review.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            reviews = []
-            for row in reader:
-                title = Title.objects.get(id=row[1])
-                author = User.objects.get(id=row[3])
-                reviews.append(Review(
-                    title=title,
-                    text=row[2],
-                    author=author,
-                    score=row[4],
-                    pub_date=row[5],
-                ))
-            Review.objects.bulk_create(reviews)
-            print(f'done {len(reviews)}')
-
-    def load_comments(self):
-        with open('static/data/comments.csv', encoding='utf-8') as csv_file:
-            reader = csv.reader(csv_file)
-            next(reader)
-            comments = []
-            for row in reader:
-                review = Review.objects.get(id=row[1])
-                author = User.objects.get(id=row[3])
-                comments.append(Comment(
-                    review=review,
-                    text=row[2],
-                    author=author,
-                    pub_date=row[4],
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            type=Path,
+            default=DEFAULT_DATA_DIR,
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк в одном bulk_create.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество процессов для разбора CSV.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Размер части файла в байтах для одного процесса.',
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help=(
+                'Добавить новые и обновить измененные строки, сравнивая '
+                'контрольные суммы с сохраненными при прошлой загрузке.'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        self.path = options['path']
+        self.batch_size = options['batch_size']
+        self.chunk_size = options['chunk_size']
+        self.upsert = options['upsert']
+        workers = options['workers']
+        if min(self.batch_size, self.chunk_size, workers) < 1:
+            raise CommandError(
+                '--batch-size, --chunk-size и --workers должны быть больше '
+                'нуля.'
+            )
+        self.id_maps = {}
+        self.executor = None
+        self.max_pending = 2 * workers
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(workers)
+        try:
+            for table in TABLES:
+                self.load_table(table)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+        update_title_rating()
+        ResourceVersion.objects.bump(
+            ResourceVersion.TITLES,
+            ResourceVersion.CATEGORIES,
+            ResourceVersion.GENRES,
+            ResourceVersion.REVIEWS,
+            ResourceVersion.COMMENTS,
+        )
+
+    def get_id_map(self, model):
+        """Множество id таблицы, загружается один раз за запуск."""
+        if model not in self.id_maps:
+            self.id_maps[model] = set(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.id_maps[model]
+
+    def read_rows(self, table):
+        """Построчно читает CSV и возвращает поля модели."""
+        path = self.path / table.filename
+        if self.executor is not None:
+            yield from self.read_rows_parallel(table, path)
+            return
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            yield from parse_rows(
+                table.parse, csv.DictReader(csv_file), self.upsert
+            )
+
+    def read_rows_parallel(self, table, path):
+        """Разбирает части файла в процессах, сохраняя порядок строк.
+
+        В работе не больше max_pending частей: следующая отправляется,
+        когда забрана самая ранняя, поэтому при медленной записи в БД
+        разобранные строки не копятся в памяти.
+        """
+        fieldnames, ranges = split_csv(path, self.chunk_size)
+        ranges = iter(ranges)
+        pending = deque()
+        while True:
+            for start, end in islice(
+                ranges, self.max_pending - len(pending)
+            ):
+                pending.append(self.executor.submit(
+                    parse_chunk, table.parse, path, fieldnames, start, end,
+                    self.upsert,
                 ))
-            Comment.objects.bulk_create(comments)
-            print(f'done {len(comments)}')
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+    def filter_references(self, table, rows):
+        """Отбрасывает строки со ссылками на отсутствующие записи."""
+        id_maps = {
+            field: self.get_id_map(model)
+            for field, model in table.references.items()
+        }
+        for values, checksum in rows:
+            if all(
+                values[field] is None or values[field] in ids
+                for field, ids in id_maps.items()
+            ):
+                yield values, checksum
+            else:
+                self.counts['skipped'] += 1
+
+    def load_table(self, table):
+        model = table.model
+        if not (self.path / table.filename).exists():
+            raise CommandError(f'Файл {table.filename} не найден.')
+        self.counts = dict.fromkeys(
+            ('created', 'updated', 'unchanged', 'skipped'), 0
+        )
+        started = time.monotonic()
+        rows = self.filter_references(table, self.read_rows(table))
+        write_batch = self.upsert_batch if self.upsert else self.insert_batch
+        try:
+            with transaction.atomic(), keep_auto_now(model):
+                if self.upsert:
+                    self.checksums = dict(
+                        ImportChecksum.objects
+                        .filter(table=model._meta.db_table)
+                        .values_list('row_id', 'checksum')
+                        .iterator()
+                    )
+                for batch in batched(rows, self.batch_size):
+                    write_batch(table, batch)
+                self.reset_sequence(model)
+        except IntegrityError as error:
+            message = (
+                f'{table.filename}: не удалось загрузить данные ({error}).'
+            )
+            if not self.upsert:
+                message += ' Для повторной загрузки используйте --upsert.'
+            raise CommandError(message)
+        self.id_maps.pop(model, None)
+        self.report(table, time.monotonic() - started)
+
+    def insert_batch(self, table, batch):
+        table.model.objects.bulk_create(
+            [table.model(**values) for values, _ in batch],
+            batch_size=self.batch_size,
+        )
+        self.counts['created'] += len(batch)
+
+    def upsert_batch(self, table, batch):
+        """Добавляет новые и обновляет измененные строки пакета."""
+        model = table.model
+        existing = self.get_id_map(model)
+        created, updated, checksums = [], [], []
+        for values, checksum in batch:
+            pk = values['id']
+            if self.checksums.get(pk) == checksum:
+                self.counts['unchanged'] += 1
+                continue
+            if pk in existing:
+                updated.append(values)
+            else:
+                created.append(model(**values))
+            checksums.append(ImportChecksum(
+                table=model._meta.db_table, row_id=pk, checksum=checksum
+            ))
+        model.objects.bulk_create(created, batch_size=self.batch_size)
+        if updated:
+            fields = [
+                field for field in updated[0]
+                if field not in CREATE_ONLY_FIELDS
+            ]
+            model.objects.bulk_update(
+                [model(**values) for values in updated],
+                fields,
+                batch_size=self.batch_size,
+            )
+        ImportChecksum.objects.filter(
+            table=model._meta.db_table,
+            row_id__in=[item.row_id for item in checksums],
+        ).delete()
+        ImportChecksum.objects.bulk_create(
+            checksums, batch_size=self.batch_size
+        )
+        existing.update(obj.pk for obj in created)
+        self.counts['created'] += len(created)
+        self.counts['updated'] += len(updated)
+
+    def reset_sequence(self, model):
+        """Сдвигает автоинкремент после вставки явных первичных ключей."""
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def report(self, table, elapsed):
+        counts = self.counts
+        count = sum(counts.values()) - counts['skipped']
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{table.filename}: {count} строк за {elapsed:.2f} с '
+            f'({rate:.0f} строк/с)'
+        )
+        if self.upsert:
+            self.stdout.write(
+                f'{table.filename}: добавлено {counts["created"]}, '
+                f'обновлено {counts["updated"]}, '
+                f'без изменений {counts["unchanged"]}'
+            )
+        if counts['skipped']:
+            self.stdout.write(self.style.WARNING(
+                f'{table.filename}: пропущено {counts["skipped"]} строк '
+                'со ссылками на отсутствующие записи'
+            ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from titles.search import (
+    SEARCH_INDEXES,
+    create_search_index,
+    drop_search_index,
+    is_search_available,
+)
+
+
+class Command(BaseCommand):
+    help = 'Пересоздает полнотекстовые индексы FTS5 и их триггеры.'
+
+    def handle(self, *args, **options):
+        if not is_search_available():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        with connection.schema_editor() as schema_editor:
+            for table in SEARCH_INDEXES:
+                drop_search_index(schema_editor, table)
+                create_search_index(schema_editor, table)
+                self.stdout.write(f'{table}: индекс пересоздан')
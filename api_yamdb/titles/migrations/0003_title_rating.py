@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 04:29
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_rating(apps, schema_editor):
+    Title = apps.get_model('titles', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    totals = (
+        Review.objects.order_by()
+        .values('title')
+        .annotate(rating_sum=Sum('score'), reviews_count=Count('pk'))
+    )
+    for total in totals.iterator():
+        Title.objects.filter(pk=total['title']).update(
+            rating_sum=total['rating_sum'],
+            reviews_count=total['reviews_count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0002_alter_title_year'),
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.RunPython(fill_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 3.2 on 2026-10-18 04:32
+
+from django.db import migrations, models
+
+
+def get_auto_through(apps):
+    Title = apps.get_model('titles', 'Title')
+    return Title._meta.get_field('genre').remote_field.through
+
+
+def copy_genre_links(apps, schema_editor):
+    """Переносит связи из автоматической M2M-таблицы в GenreTitle."""
+    GenreTitle = apps.get_model('titles', 'GenreTitle')
+    AutoThrough = get_auto_through(apps)
+    seen = set()
+    duplicates = []
+    for pk, title_id, genre_id in (
+        GenreTitle.objects.order_by('id')
+        .values_list('id', 'title_id', 'genre_id')
+        .iterator()
+    ):
+        if (title_id, genre_id) in seen:
+            duplicates.append(pk)
+        seen.add((title_id, genre_id))
+    GenreTitle.objects.filter(pk__in=duplicates).delete()
+    GenreTitle.objects.bulk_create(
+        [
+            GenreTitle(title_id=title_id, genre_id=genre_id)
+            for title_id, genre_id in AutoThrough.objects.values_list(
+                'title_id', 'genre_id'
+            ).iterator()
+            if (title_id, genre_id) not in seen
+        ],
+        batch_size=500,
+    )
+
+
+def restore_genre_links(apps, schema_editor):
+    GenreTitle = apps.get_model('titles', 'GenreTitle')
+    AutoThrough = get_auto_through(apps)
+    AutoThrough.objects.bulk_create(
+        [
+            AutoThrough(title_id=title_id, genre_id=genre_id)
+            for title_id, genre_id in GenreTitle.objects.values_list(
+                'title_id', 'genre_id'
+            ).iterator()
+        ],
+        batch_size=500,
+    )
+
+
+def drop_auto_through(apps, schema_editor):
+    schema_editor.delete_model(get_auto_through(apps))
+
+
+def create_auto_through(apps, schema_editor):
+    schema_editor.create_model(get_auto_through(apps))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_genre_links, restore_genre_links),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_genre_title'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genretitle_genre_title_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_auto_through, create_auto_through),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='title',
+                    name='genre',
+                    field=models.ManyToManyField(related_name='titles', through='titles.GenreTitle', to='titles.Genre', verbose_name='Жанр'),
+                ),
+            ],
+        ),
+    ]
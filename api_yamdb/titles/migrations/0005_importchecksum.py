@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0004_genre_through_genretitle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportChecksum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('table', models.CharField(max_length=50, verbose_name='Таблица')),
+                ('row_id', models.BigIntegerField(verbose_name='Id строки')),
+                ('checksum', models.CharField(max_length=32, verbose_name='Контрольная сумма')),
+            ],
+            options={
+                'verbose_name': 'Контрольная сумма импорта',
+                'verbose_name_plural': 'Контрольные суммы импорта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importchecksum',
+            constraint=models.UniqueConstraint(fields=('table', 'row_id'), name='unique_import_checksum'),
+        ),
+    ]
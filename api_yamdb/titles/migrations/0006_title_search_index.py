@@ -0,0 +1,24 @@
+# Generated by Django 3.2 on 2026-10-18 05:10
+
+from django.db import migrations
+
+from titles.search import create_search_index, drop_search_index
+
+
+def create_index(apps, schema_editor):
+    create_search_index(schema_editor, 'titles_title')
+
+
+def drop_index(apps, schema_editor):
+    drop_search_index(schema_editor, 'titles_title')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0005_importchecksum'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 04:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0006_title_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Ресурс')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Версия')),
+            ],
+            options={
+                'verbose_name': 'Версия ресурса',
+                'verbose_name_plural': 'Версии ресурсов',
+            },
+        ),
+    ]
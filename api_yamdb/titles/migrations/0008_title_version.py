@@ -0,0 +1,28 @@
+# Generated by Django 3.2 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+from titles.search import create_search_index, drop_search_index
+
+
+def rebuild_index(apps, schema_editor):
+    """Пересоздание таблицы в SQLite удаляет триггеры поискового индекса."""
+    drop_search_index(schema_editor, 'titles_title')
+    create_search_index(schema_editor, 'titles_title')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titles', '0007_resourceversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, rebuild_index),
+        migrations.AddField(
+            model_name='title',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Версия'),
+        ),
+        migrations.RunPython(rebuild_index, migrations.RunPython.noop),
+    ]
@@ -29,13 +29,23 @@ class Genre(models.Model):
         return self.name
 
 
+class TitleManager(models.Manager):
+
+    def bump_versions(self, ids):
+        """Меняет версии представлений произведений в кэше API."""
+        self.filter(pk__in=ids).update(version=models.F('version') + 1)
+
+
 class Title(models.Model):
     name = models.CharField('Имя произведения', max_length=256)
     year = models.PositiveSmallIntegerField('Год выпуска',
                                             validators=[valid_date])
     description = models.CharField('Описание', max_length=256)
     genre = models.ManyToManyField(
-        Genre, related_name='titles', verbose_name='Жанр'
+        Genre,
+        through='GenreTitle',
+        related_name='titles',
+        verbose_name='Жанр',
     )
     category = models.ForeignKey(
         Category,
@@ -44,6 +54,15 @@ class Title(models.Model):
         null=True,
         verbose_name='Категория',
     )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0
+    )
+    version = models.PositiveIntegerField(
+        'Версия', default=1, editable=False
+    )
+
+    objects = TitleManager()
 
     class Meta:
         verbose_name = 'Произведение'
@@ -53,6 +72,13 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка по сохраненным сумме и количеству отзывов."""
+        if not self.reviews_count:
+            return None
+        return self.rating_sum / self.reviews_count
+
 
 class GenreTitle(models.Model):
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -62,6 +88,89 @@ class GenreTitle(models.Model):
         verbose_name = 'Название жанра'
         verbose_name_plural = 'Названия жанров'
         ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_genre_title'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='genretitle_genre_title_idx',
+            )
+        ]
 
     def __str__(self):
         return str(self.id)
+
+
+class ImportChecksum(models.Model):
+    """Контрольная сумма строки CSV, загруженной командой load_data."""
+
+    table = models.CharField('Таблица', max_length=50)
+    row_id = models.BigIntegerField('Id строки')
+    checksum = models.CharField('Контрольная сумма', max_length=32)
+
+    class Meta:
+        verbose_name = 'Контрольная сумма импорта'
+        verbose_name_plural = 'Контрольные суммы импорта'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['table', 'row_id'],
+                name='unique_import_checksum'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.table}:{self.row_id}'
+
+
+class ResourceVersionManager(models.Manager):
+
+    def bump(self, *names):
+        """Увеличивает версии ресурсов, отсутствующие создает."""
+        updated = self.filter(name__in=names).update(
+            version=models.F('version') + 1
+        )
+        if updated < len(names):
+            existing = set(
+                self.filter(name__in=names).values_list('name', flat=True)
+            )
+            self.bulk_create(
+                [
+                    self.model(name=name)
+                    for name in names if name not in existing
+                ],
+                ignore_conflicts=True,
+            )
+
+    def get_versions(self, names):
+        """Словарь версий ресурсов; у неизвестных версия 0."""
+        versions = dict.fromkeys(names, 0)
+        versions.update(
+            self.filter(name__in=names).values_list('name', 'version')
+        )
+        return versions
+
+
+class ResourceVersion(models.Model):
+    """Счетчик изменений ресурса API для условных GET-запросов."""
+
+    TITLES = 'titles'
+    CATEGORIES = 'categories'
+    GENRES = 'genres'
+    REVIEWS = 'reviews'
+    COMMENTS = 'comments'
+
+    name = models.CharField('Ресурс', max_length=50, unique=True)
+    version = models.PositiveBigIntegerField('Версия', default=1)
+
+    objects = ResourceVersionManager()
+
+    class Meta:
+        verbose_name = 'Версия ресурса'
+        verbose_name_plural = 'Версии ресурсов'
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
@@ -0,0 +1,114 @@
+"""Полнотекстовые индексы SQLite FTS5 для произведений и отзывов.
+
+Индекс хранит только ссылки на строки исходной таблицы (external content)
+и обновляется триггерами, поэтому bulk_create и загрузка данных тоже
+попадают в поиск. Пересоздание таблицы миграцией SQLite удаляет триггеры:
+после таких миграций нужно выполнить команду rebuild_search_index.
+"""
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+TOKENIZE = 'unicode61 remove_diacritics 2'
+
+SEARCH_INDEXES = {
+    'titles_title': ('name', 'description'),
+    'reviews_review': ('text',),
+}
+
+
+def get_index_table(table):
+    return f'{table}_fts'
+
+
+def create_index_sql(table, columns):
+    index = get_index_table(table)
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    delete_old = (
+        f"INSERT INTO {index}({index}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+    insert_new = (
+        f'INSERT INTO {index}(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='{TOKENIZE}')",
+        f'CREATE TRIGGER IF NOT EXISTS {index}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert_new} END',
+        f'CREATE TRIGGER IF NOT EXISTS {index}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete_old} END',
+        f'CREATE TRIGGER IF NOT EXISTS {index}_au AFTER UPDATE OF {names} '
+        f'ON {table} BEGIN {delete_old} {insert_new} END',
+        f"INSERT INTO {index}({index}) VALUES ('rebuild')",
+    ]
+
+
+def drop_index_sql(table):
+    index = get_index_table(table)
+    return [
+        f'DROP TRIGGER IF EXISTS {index}_ai',
+        f'DROP TRIGGER IF EXISTS {index}_ad',
+        f'DROP TRIGGER IF EXISTS {index}_au',
+        f'DROP TABLE IF EXISTS {index}',
+    ]
+
+
+def create_search_index(schema_editor, table):
+    """Создает индекс и триггеры; на других СУБД ничего не делает."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in create_index_sql(table, SEARCH_INDEXES[table]):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(schema_editor, table):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in drop_index_sql(table):
+        schema_editor.execute(sql)
+
+
+def is_search_available():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """Превращает пользовательский ввод в безопасный запрос MATCH.
+
+    Каждое слово берется в кавычки, последнее ищется по префиксу.
+    """
+    terms = [
+        '"{}"'.format(term.replace('"', '""'))
+        for term in text.replace(',', ' ').split()
+    ]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_queryset(queryset, match):
+    """Оставляет найденные строки и сортирует их по релевантности."""
+    table = queryset.model._meta.db_table
+    index = get_index_table(table)
+    return queryset.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {index} WHERE {index} MATCH %s', (match,)
+    )).annotate(search_rank=RawSQL(
+        f'SELECT rank FROM {index} WHERE {index} MATCH %s '
+        f'AND rowid = "{table}"."id"',
+        (match,),
+    )).order_by('search_rank', 'pk')
+
+
+def search_ids(model, match, limit):
+    """Id лучших по релевантности строк модели."""
+    index = get_index_table(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {index} WHERE {index} MATCH %s '
+            'ORDER BY rank LIMIT %s',
+            (match, limit),
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,58 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Genre, GenreTitle, ResourceVersion, Title
+
+CATALOG_VERSIONS = {
+    Title: (ResourceVersion.TITLES,),
+    GenreTitle: (ResourceVersion.TITLES,),
+    Category: (ResourceVersion.CATEGORIES, ResourceVersion.TITLES),
+    Genre: (ResourceVersion.GENRES, ResourceVersion.TITLES),
+}
+
+
+def catalog_changed(sender, raw=False, **kwargs):
+    """Меняет версии каталога при изменении его моделей."""
+    if not raw:
+        ResourceVersion.objects.bump(*CATALOG_VERSIONS[sender])
+
+
+for model in CATALOG_VERSIONS:
+    post_save.connect(catalog_changed, sender=model)
+    post_delete.connect(catalog_changed, sender=model)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def title_changed(sender, instance, created=False, raw=False, **kwargs):
+    """Меняет версию представления измененного произведения."""
+    if raw or sender is Title and created:
+        return
+    Title.objects.bump_versions(
+        [instance.pk if sender is Title else instance.title_id]
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    """Жанры входят в представление произведения.
+
+    Со стороны жанра clear() не передает pk_set, поэтому произведения
+    жанра запоминаются до очистки.
+    """
+    if action == 'pre_clear' and reverse:
+        instance._cleared_titles = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+    if not action.startswith('post_'):
+        return
+    ResourceVersion.objects.bump(ResourceVersion.TITLES)
+    if not reverse:
+        title_ids = [instance.pk]
+    elif pk_set is None:
+        title_ids = instance.__dict__.pop('_cleared_titles', [])
+    else:
+        title_ids = pk_set
+    Title.objects.bump_versions(title_ids)
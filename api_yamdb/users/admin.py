@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import OutboxEmail, User
 
 
 class UserAdmin(BaseUserAdmin):
@@ -55,4 +55,13 @@ class UserAdmin(BaseUserAdmin):
     ordering = ('username',)
 
 
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'created', 'attempts', 'sent_at')
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+    readonly_fields = ('created', 'sent_at', 'attempts', 'last_error')
+    exclude = ('body',)
+
+
 admin.site.register(User, UserAdmin)
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
@@ -0,0 +1,127 @@
+"""Пакетная отправка писем из очереди OutboxEmail."""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.filebased import (
+    EmailBackend as FileEmailBackend,
+)
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+class SendProgress:
+    """Итератор писем, запоминающий, сколько из них взял почтовый бэкенд.
+
+    Бэкенды Django отправляют письма по порядку, поэтому при ошибке
+    все письма до последнего взятого отправлены, а последнее — нет.
+    """
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.taken = 0
+
+    def __iter__(self):
+        for message in self.messages:
+            self.taken += 1
+            yield message
+
+
+class OutboxDispatcher:
+    """Отправляет письма очереди пачками через одно соединение.
+
+    Пачка отправляется, когда набралось batch_size писем или самое
+    старое из них ждет дольше flush_interval секунд.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None,
+                 connection=None):
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        if flush_interval is None:
+            flush_interval = settings.EMAIL_OUTBOX_FLUSH_INTERVAL
+        self.flush_interval = flush_interval
+        self.connection = connection or get_connection(fail_silently=False)
+
+    def is_ready(self):
+        """Пора ли отправлять очередную пачку."""
+        pending = OutboxEmail.objects.pending().order_by('send_after', 'id')
+        oldest = pending.values_list('send_after', flat=True).first()
+        if oldest is None:
+            return False
+        if oldest <= timezone.now() - timedelta(seconds=self.flush_interval):
+            return True
+        return pending[:self.batch_size].count() >= self.batch_size
+
+    def flush(self):
+        """Отправляет одну пачку, возвращает (отправлено, с ошибкой)."""
+        emails = OutboxEmail.objects.claim(self.batch_size)
+        if not emails:
+            return 0, 0
+        try:
+            self.connection.open()
+        except Exception as error:
+            for email in emails:
+                email.mark_failed(error)
+            return 0, len(emails)
+        progress = SendProgress(
+            [email.to_message(self.connection) for email in emails]
+        )
+        try:
+            self.connection.send_messages(progress)
+        except Exception as error:
+            sent = max(progress.taken - 1, 0)
+            OutboxEmail.objects.mark_sent(emails[:sent])
+            emails[sent].mark_failed(error)
+            OutboxEmail.objects.release(emails[sent + 1:])
+            return sent, 1
+        OutboxEmail.objects.mark_sent(emails)
+        return len(emails), 0
+
+    def drain(self):
+        """Отправляет все готовые письма, не дожидаясь полной пачки."""
+        sent = failed = 0
+        try:
+            while True:
+                batch_sent, batch_failed = self.flush()
+                if not batch_sent and not batch_failed:
+                    return sent, failed
+                sent += batch_sent
+                failed += batch_failed
+        finally:
+            self.connection.close()
+
+    def run(self, poll_interval):
+        """Бесконечный цикл обработчика очереди."""
+        while True:
+            if not self.is_ready():
+                self.connection.close()
+                time.sleep(poll_interval)
+                continue
+            yield self.flush()
+
+
+class StubEmailBackend(FileEmailBackend):
+    """Почтовый бэкенд для замеров без сети.
+
+    Пишет письма в файл, как filebased, и имитирует задержки SMTP:
+    connect_delay на открытие соединения и send_delay на каждое письмо.
+    """
+
+    def __init__(self, *args, connect_delay=0, send_delay=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connect_delay = connect_delay
+        self.send_delay = send_delay
+        self.connections_opened = 0
+
+    def open(self):
+        opened = super().open()
+        if opened:
+            self.connections_opened += 1
+            time.sleep(self.connect_delay)
+        return opened
+
+    def write_message(self, message):
+        time.sleep(self.send_delay)
+        super().write_message(message)
@@ -0,0 +1,98 @@
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mail
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from users.mail import OutboxDispatcher
+from users.models import OutboxEmail
+
+STUB_BACKEND = 'users.mail.StubEmailBackend'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность отправки писем: send_mail с '
+        'отдельным соединением на письмо и пакетная отправка очереди. '
+        'Используется бэкенд-заглушка с имитацией задержек SMTP, данные '
+        'создаются во временной тестовой БД.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--connect-delay',
+            type=float,
+            default=0.05,
+            help='Имитация установки соединения, с.',
+        )
+        parser.add_argument(
+            '--send-delay',
+            type=float,
+            default=0.001,
+            help='Имитация передачи одного письма, с.',
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            with tempfile.TemporaryDirectory() as file_path:
+                self.run(file_path, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def get_stub(self, file_path, options):
+        return get_connection(
+            STUB_BACKEND,
+            fail_silently=False,
+            file_path=file_path,
+            connect_delay=options['connect_delay'],
+            send_delay=options['send_delay'],
+        )
+
+    def run(self, file_path, options):
+        count = options['messages']
+        started = time.monotonic()
+        for idx in range(count):
+            send_mail(
+                'Код подтверждения',
+                'Ваш код подтверждения: 0',
+                settings.SENDER_EMAIL,
+                [f'user{idx}@yamdb.fake'],
+                connection=self.get_stub(file_path, options),
+            )
+        self.report('send_mail', count, count, time.monotonic() - started)
+
+        OutboxEmail.objects.bulk_create(
+            OutboxEmail(
+                subject='Код подтверждения',
+                body='Ваш код подтверждения: 0',
+                from_email=settings.SENDER_EMAIL,
+                recipient=f'user{idx}@yamdb.fake',
+            )
+            for idx in range(count)
+        )
+        stub = self.get_stub(file_path, options)
+        dispatcher = OutboxDispatcher(
+            batch_size=options['batch_size'], connection=stub
+        )
+        started = time.monotonic()
+        sent, _ = dispatcher.drain()
+        self.report(
+            'очередь', sent, stub.connections_opened,
+            time.monotonic() - started,
+        )
+
+    def report(self, name, count, connections, elapsed):
+        rate = count / elapsed if elapsed else count
+        self.stdout.write(
+            f'{name:<12}{count:>8} писем{connections:>8} соединений'
+            f'{elapsed:>10.2f} с{rate:>10.0f} писем/с'
+        )
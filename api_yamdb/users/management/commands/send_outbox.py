@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.mail import OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutboxEmail пачками через одно '
+        'соединение с почтовым сервером. Неудачные отправки повторяются '
+        'с растущей задержкой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help='Наибольшее количество писем в одной пачке.',
+        )
+        parser.add_argument(
+            '--flush-interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_FLUSH_INTERVAL,
+            help=(
+                'Сколько секунд письмо может ждать, пока набирается '
+                'полная пачка.'
+            ),
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза в секундах между проверками очереди.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить все готовые письма и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше нуля.')
+        dispatcher = OutboxDispatcher(
+            batch_size=options['batch_size'],
+            flush_interval=options['flush_interval'],
+        )
+        if options['once']:
+            self.report(*dispatcher.drain())
+            return
+        for sent, failed in dispatcher.run(options['interval']):
+            self.report(sent, failed)
+
+    def report(self, sent, failed):
+        if sent or failed:
+            self.stdout.write(f'отправлено: {sent}, ошибок: {failed}')
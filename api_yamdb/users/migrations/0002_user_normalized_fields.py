@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 04:43
+
+from django.db import migrations, models
+import users.models
+
+
+def fill_normalized(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    users = []
+    for user in User.objects.only('username', 'email').iterator():
+        user.username_normalized = user.username.lower()
+        user.email_normalized = user.email.lower()
+        users.append(user)
+    User.objects.bulk_update(
+        users, ['username_normalized', 'email_normalized'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', users.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='email_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_normalized',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_normalized, migrations.RunPython.noop),
+    ]
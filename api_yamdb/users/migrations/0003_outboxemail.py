@@ -0,0 +1,42 @@
+# Generated by Django 3.2 on 2026-10-18 05:07
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_normalized_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('from_email', models.EmailField(max_length=254)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('lease', models.UUIDField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': 'Письмо в очереди',
+                'verbose_name_plural': 'Очередь писем',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(condition=models.Q(('sent_at__isnull', True)), fields=['send_after', 'id'], name='outbox_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='outboxemail',
+            index=models.Index(fields=['lease'], name='outbox_lease_idx'),
+        ),
+    ]
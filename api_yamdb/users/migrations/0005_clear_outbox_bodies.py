@@ -0,0 +1,25 @@
+# Generated by Django 3.2 on 2026-10-18 13:05
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Q
+
+
+def clear_bodies(apps, schema_editor):
+    """Стирает коды подтверждения у отправленных и брошенных писем."""
+    OutboxEmail = apps.get_model('users', 'OutboxEmail')
+    OutboxEmail.objects.filter(
+        Q(sent_at__isnull=False)
+        | Q(attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+    ).update(body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 15:10
+
+from django.db import migrations
+
+TRIGGERS = ('users_user_normalized_ai', 'users_user_normalized_au')
+
+
+def drop_triggers(apps, schema_editor):
+    """Удаляет триггеры нормализованных полей пользователя.
+
+    Триггеры вызывали функцию, которая есть только на соединениях
+    приложения: вставка пользователя из dbshell или утилит резервного
+    копирования падала. Поля заполняет User.save() и загрузка данных.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_clear_outbox_bodies'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_triggers, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,61 @@
+import sys
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as BaseUserManager
 from django.core import validators
+from django.core.mail import EmailMessage
 from django.db import models
+from django.utils import timezone
+
+NORMALIZED_FIELDS = {
+    'username': 'username_normalized',
+    'email': 'email_normalized',
+}
+SURROGATES = range(0xD800, 0xE000)
+
+
+def get_prefix_upper_bound(prefix):
+    """Первая строка, которая больше всех строк с данным префиксом.
+
+    Завершающие U+10FFFF увеличить нельзя, они отбрасываются; если
+    префикс состоит только из них, границы нет и возвращается None.
+    Суррогатные символы пропускаются: их нельзя записать в UTF-8.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    if code in SURROGATES:
+        code = SURROGATES.stop
+    return prefix[:-1] + chr(code)
+
+
+class UserManager(BaseUserManager):
+
+    def autocomplete(self, prefix, limit):
+        """Автодополнение по началу username или email.
+
+        Для каждого поля выполняется диапазонный запрос по индексу
+        нормализованного столбца с LIMIT, без COUNT и LIKE.
+        """
+        prefix = prefix.lower()
+        if not prefix:
+            return []
+        upper = get_prefix_upper_bound(prefix)
+        found = {}
+        for field in NORMALIZED_FIELDS.values():
+            lookups = {f'{field}__gte': prefix}
+            if upper is not None:
+                lookups[f'{field}__lt'] = upper
+            users = self.filter(**lookups).order_by(field)[:limit]
+            for user in users:
+                found[user.pk] = user
+        return sorted(
+            found.values(), key=lambda user: user.username_normalized
+        )[:limit]
 
 
 class User(AbstractUser):
@@ -26,6 +81,26 @@ class User(AbstractUser):
         unique=True,
         validators=[validators.RegexValidator(r'^[\w.@+-]+$')],
     )
+    username_normalized = models.CharField(
+        max_length=150, db_index=True, editable=False, default=''
+    )
+    email_normalized = models.CharField(
+        max_length=254, db_index=True, editable=False, default=''
+    )
+
+    objects = UserManager()
+
+    def save(self, *args, **kwargs):
+        """Обновляет нормализованные username и email для автодополнения."""
+        self.username_normalized = self.username.lower()
+        self.email_normalized = self.email.lower()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                normalized for field, normalized in NORMALIZED_FIELDS.items()
+                if field in update_fields
+            }
+        super().save(*args, **kwargs)
 
     @property
     def is_admin(self):
@@ -34,3 +109,119 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == self.MODERATOR
+
+
+class OutboxEmailManager(models.Manager):
+
+    def enqueue(self, subject, body, from_email, recipient):
+        """Ставит письмо в очередь в текущей транзакции."""
+        return self.create(
+            subject=subject,
+            body=body,
+            from_email=from_email,
+            recipient=recipient,
+        )
+
+    def pending(self, now=None):
+        return self.filter(
+            sent_at__isnull=True,
+            send_after__lte=now or timezone.now(),
+            attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        )
+
+    def claim(self, batch_size):
+        """Забирает пачку готовых к отправке писем.
+
+        Письма получают метку lease и откладываются на время
+        EMAIL_OUTBOX_LEASE: параллельный обработчик их не возьмет, а после
+        падения обработчика они вернутся в очередь.
+        """
+        now = timezone.now()
+        lease = uuid.uuid4()
+        ids = list(
+            self.pending(now)
+            .order_by('send_after', 'id')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        self.pending(now).filter(pk__in=ids).update(
+            lease=lease,
+            send_after=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+        )
+        return list(self.filter(lease=lease).order_by('send_after', 'id'))
+
+    def mark_sent(self, emails):
+        """Отмечает письма отправленными и стирает их текст.
+
+        В тексте код подтверждения, который обменивается на токен, хранить
+        его после отправки незачем.
+        """
+        self.filter(pk__in=[email.pk for email in emails]).update(
+            sent_at=timezone.now(), lease=None, body=''
+        )
+
+    def release(self, emails):
+        """Возвращает в очередь письма, до которых не дошла отправка."""
+        self.filter(pk__in=[email.pk for email in emails]).update(
+            send_after=timezone.now(), lease=None
+        )
+
+
+class OutboxEmail(models.Model):
+    """Письмо, ожидающее отправки обработчиком send_outbox."""
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.EmailField()
+    recipient = models.EmailField()
+    created = models.DateTimeField(auto_now_add=True)
+    send_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    lease = models.UUIDField(null=True, blank=True, editable=False)
+
+    objects = OutboxEmailManager()
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=['send_after', 'id'],
+                name='outbox_pending_idx',
+                condition=models.Q(sent_at__isnull=True),
+            ),
+            models.Index(fields=['lease'], name='outbox_lease_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+    def to_message(self, connection=None):
+        return EmailMessage(
+            self.subject,
+            self.body,
+            self.from_email,
+            [self.recipient],
+            connection=connection,
+        )
+
+    def mark_failed(self, error):
+        """Откладывает повтор с экспоненциально растущей задержкой.
+
+        После последней попытки текст письма стирается, как и после
+        отправки.
+        """
+        self.attempts += 1
+        delay = min(
+            settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (self.attempts - 1),
+            settings.EMAIL_OUTBOX_MAX_RETRY_DELAY,
+        )
+        self.send_after = timezone.now() + timedelta(seconds=delay)
+        self.last_error = str(error)
+        self.lease = None
+        if self.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            self.body = ''
+        self.save(update_fields=[
+            'attempts', 'send_after', 'last_error', 'lease', 'body'
+        ])
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,4 +33,21 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_budget',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    from django.core.cache import caches
+
+    from api.authentication import user_cache
+    from api.fields import SLUG_MAPS
+    from api.throttling import throttle_backend
+
+    for cache in caches.all():
+        cache.clear()
+    user_cache.clear()
+    throttle_backend.clear()
+    for slug_map in SLUG_MAPS.values():
+        slug_map.clear()
@@ -0,0 +1,217 @@
+"""Бюджет запросов к БД для эндпоинтов API.
+
+Во время тестов `test_01`-`test_06` каждый запрос тестового клиента
+записывается: число запросов к БД и время ответа. После теста число
+запросов сравнивается с бюджетом из `tests/query_budget.json`, превышение
+считается регрессией. Время ответа между прогонами нестабильно, поэтому
+только выводится в отчете. Запросы методами, которых нет у маршрута,
+не записываются. Пересчитать бюджет: `pytest --update-budget`.
+"""
+import json
+import time
+from collections import defaultdict
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+BUDGET_PATH = Path(__file__).resolve().parent.parent / 'query_budget.json'
+BUDGET_MODULES = (
+    'test_01_users',
+    'test_02_category',
+    'test_03_genre',
+    'test_04_title',
+    'test_05_review',
+    'test_06_comment',
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--update-budget',
+        action='store_true',
+        help='Перезаписать tests/query_budget.json по результатам прогона.',
+    )
+
+
+def get_endpoint(method, path):
+    """Ключ эндпоинта: метод и имя маршрута, а не конкретный адрес.
+
+    None, если у маршрута вьюсета нет действия для метода.
+    """
+    path = urlsplit(path).path
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return f'{method} {path}'
+    actions = getattr(match.func, 'actions', None)
+    if actions is not None and method.lower() not in actions:
+        return None
+    return f'{method} {match.view_name}'
+
+
+class BudgetRecorder:
+
+    def __init__(self):
+        self.observed = {}
+        self.scaling = defaultdict(dict)
+        self.requests = None
+
+    def record(self, endpoint, queries, elapsed_ms):
+        if self.requests is not None:
+            self.requests.append((endpoint, queries, elapsed_ms))
+        max_queries, max_ms = self.observed.get(endpoint, (0, 0))
+        self.observed[endpoint] = (
+            max(max_queries, queries), max(max_ms, elapsed_ms)
+        )
+
+    def load_budget(self):
+        if not BUDGET_PATH.exists():
+            return {}
+        return json.loads(BUDGET_PATH.read_text(encoding='utf-8'))
+
+    def save_budget(self):
+        """Обновляет бюджет наблюдавшихся эндпоинтов, остальные сохраняет."""
+        budget = self.load_budget()
+        for endpoint, (queries, _) in self.observed.items():
+            budget[endpoint] = {'queries': queries}
+        BUDGET_PATH.write_text(
+            json.dumps(
+                dict(sorted(budget.items())), ensure_ascii=False, indent=2
+            ) + '\n',
+            encoding='utf-8',
+        )
+
+    def check(self, requests, budget):
+        """Сообщения о превышении бюджета запросами теста."""
+        errors = []
+        for endpoint, queries, _ in requests:
+            limits = budget.get(endpoint)
+            if limits is None:
+                errors.append(
+                    f'{endpoint}: нет в бюджете, выполните pytest '
+                    '--update-budget'
+                )
+                continue
+            if queries > limits['queries']:
+                errors.append(
+                    f'{endpoint}: {queries} запросов к БД при бюджете '
+                    f'{limits["queries"]}'
+                )
+        return list(dict.fromkeys(errors))
+
+
+recorder = BudgetRecorder()
+
+
+@pytest.fixture
+def measure_requests(monkeypatch):
+    """Записывает число запросов к БД и время каждого запроса клиента."""
+    request_method = Client.request
+
+    def measured_request(client, **request):
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as captured:
+            response = request_method(client, **request)
+        endpoint = get_endpoint(
+            request['REQUEST_METHOD'], request['PATH_INFO']
+        )
+        if (
+            endpoint is None
+            or response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+        ):
+            return response
+        recorder.record(
+            endpoint,
+            len(captured),
+            (time.perf_counter() - started) * 1000,
+        )
+        return response
+
+    monkeypatch.setattr(Client, 'request', measured_request)
+    return recorder
+
+
+@pytest.fixture
+def measure_page():
+    """Замеряет первую страницу списка заданного размера без кэша.
+
+    Результаты попадают в отчет о масштабировании страниц.
+    """
+    from django.core.cache import caches
+
+    from api.authentication import user_cache
+
+    def measure(client, url, page_size):
+        for cache in caches.all():
+            cache.clear()
+        user_cache.clear()
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(url, {'page_size': page_size})
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        recorder.scaling[get_endpoint('GET', url)][page_size] = (
+            len(captured), elapsed_ms
+        )
+        return response, len(captured)
+
+    return measure
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request):
+    module = request.module.__name__.rpartition('.')[2]
+    if module not in BUDGET_MODULES:
+        yield
+        return
+    request.getfixturevalue('measure_requests')
+    recorder.requests = []
+    yield
+    requests, recorder.requests = recorder.requests, None
+    if request.config.getoption('--update-budget'):
+        return
+    errors = recorder.check(requests, recorder.load_budget())
+    if errors:
+        pytest.fail(
+            'Превышен бюджет эндпоинтов (tests/query_budget.json):\n'
+            + '\n'.join(errors),
+            pytrace=False,
+        )
+
+
+def pytest_sessionfinish(session):
+    if session.config.getoption('--update-budget') and recorder.observed:
+        recorder.save_budget()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if recorder.observed:
+        terminalreporter.section('бюджет эндпоинтов')
+        terminalreporter.write_line(
+            f'{"эндпоинт":<40}{"запросов":>10}{"мс":>10}'
+        )
+        for endpoint, (queries, elapsed_ms) in sorted(
+            recorder.observed.items()
+        ):
+            terminalreporter.write_line(
+                f'{endpoint:<40}{queries:>10}{elapsed_ms:>10.1f}'
+            )
+    if recorder.scaling:
+        terminalreporter.section('масштабирование страниц')
+        sizes = sorted({
+            size for results in recorder.scaling.values() for size in results
+        })
+        terminalreporter.write_line(f'{"эндпоинт":<40}' + ''.join(
+            f'{f"{size} строк":>20}' for size in sizes
+        ))
+        for endpoint, results in sorted(recorder.scaling.items()):
+            terminalreporter.write_line(f'{endpoint:<40}' + ''.join(
+                f'{"{} / {:.1f} мс".format(*results[size]):>20}'
+                if size in results else f'{"-":>20}'
+                for size in sizes
+            ))
@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import create_single_review, create_titles
+from titles.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_changes(self, client, admin_client,
+                                              user_client, moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'review', 2)
+        review = create_single_review(
+            moderator_client, title_id, 'review', 6
+        ).json()
+        assert self.get_rating(client, title_id) == 4, (
+            'Проверьте, что рейтинг произведения обновляется при создании '
+            'отзыва.'
+        )
+
+        moderator_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            ),
+            data={'score': 10}
+        )
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг произведения обновляется при изменении '
+            'оценки в отзыве.'
+        )
+
+        moderator_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review['id']
+            )
+        )
+        assert self.get_rating(client, title_id) == 2, (
+            'Проверьте, что рейтинг произведения обновляется при удалении '
+            'отзыва.'
+        )
+
+    def test_02_rating_follows_author_deletion(self, client, admin_client,
+                                               user, user_client,
+                                               moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'review', 2)
+        create_single_review(moderator_client, title_id, 'review', 6)
+
+        user.delete()
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что при удалении пользователя его отзывы '
+            'исключаются из рейтинга произведения.'
+        )
+
+    def test_03_rating_with_stale_review(self, admin_client, user_client):
+        """Два изменения одного отзыва, прочитанного до обоих."""
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'review', 5
+        ).json()['id']
+        first = Review.objects.get(pk=review_id)
+        second = Review.objects.get(pk=review_id)
+
+        first.score = 8
+        first.save()
+        second.score = 2
+        second.save()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count) == (2, 1), (
+            'Проверьте, что изменение рейтинга считается от оценки, '
+            'сохраненной в БД, а не прочитанной до транзакции.'
+        )
+
+        first.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.reviews_count) == (0, 0)
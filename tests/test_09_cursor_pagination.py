@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Review
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09CursorPagination:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    REVIEWS_COUNT = 25
+
+    def create_reviews(self, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        for idx in range(self.REVIEWS_COUNT):
+            author = django_user_model.objects.create_user(
+                username=f'cursor_user_{idx}',
+                email=f'cursor_user_{idx}@yamdb.fake',
+            )
+            Review.objects.create(
+                title_id=title_id, author=author, text=str(idx), score=5
+            )
+        return self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+
+    def collect_pages(self, client, url, link_key):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме курсорной пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            ids.append([review['id'] for review in data['results']])
+            url = data[link_key]
+        return ids
+
+    def test_01_cursor_pages(self, client, admin_client, django_user_model):
+        url = self.create_reviews(admin_client, django_user_model)
+        expected = list(
+            Review.objects.order_by('-pub_date', '-id')
+            .values_list('id', flat=True)
+        )
+
+        pages = self.collect_pages(client, f'{url}?cursor=', 'next')
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == expected, (
+            'Проверьте, что курсорная пагинация возвращает отзывы по '
+            'убыванию `pub_date` без пропусков и повторов.'
+        )
+
+        last_page = client.get(f'{url}?cursor=').json()
+        while last_page['next']:
+            last_page = client.get(last_page['next']).json()
+        back = self.collect_pages(client, last_page['previous'], 'previous')
+        assert sum(reversed(back), []) == expected[:20], (
+            'Проверьте, что ссылка `previous` в режиме курсорной пагинации '
+            'возвращает предыдущие страницы.'
+        )
+
+    def test_02_cursor_stable_on_insert(self, client, admin_client,
+                                        django_user_model, user):
+        url = self.create_reviews(admin_client, django_user_model)
+        first_page = client.get(f'{url}?cursor=').json()
+        title_id = Review.objects.first().title_id
+        Review.objects.create(title_id=title_id, author=user, text='new',
+                              score=1)
+        second_page = client.get(first_page['next']).json()
+        first_ids = {review['id'] for review in first_page['results']}
+        assert not first_ids & {
+            review['id'] for review in second_page['results']
+        }, (
+            'Проверьте, что новые отзывы не сдвигают страницы курсорной '
+            'пагинации.'
+        )
+
+    def test_03_invalid_cursor(self, client, admin_client,
+                               django_user_model):
+        url = self.create_reviews(admin_client, django_user_model)
+        response = client.get(f'{url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_page_number_mode_kept(self, client, admin_client,
+                                      django_user_model):
+        url = self.create_reviews(admin_client, django_user_model)
+        data = client.get(url).json()
+        assert data['count'] == self.REVIEWS_COUNT
+        assert len(data['results']) == 10
@@ -0,0 +1,164 @@
+import csv
+import io
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+from tests.conftest import MANAGE_PATH
+from titles.csv_rows import parse_chunk, parse_review, split_csv
+from titles.management.commands.load_data import TABLES, Command
+from titles.models import Category, GenreTitle, Title
+from users.models import User
+
+DATA_DIR = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10LoadData:
+
+    def test_01_load_data(self):
+        call_command('load_data', batch_size=7)
+
+        assert User.objects.filter(pk=100, username='bingobongo').exists(), (
+            'Проверьте, что команда `load_data` сохраняет id пользователей '
+            'из CSV.'
+        )
+        assert Category.objects.get(pk=1).slug == 'movie'
+        assert GenreTitle.objects.filter(title_id=1, genre_id=1).exists()
+        assert Title.objects.get(pk=1).genre.filter(slug='drama').exists(), (
+            'Проверьте, что связи жанров из `genre_title.csv` доступны '
+            'через `Title.genre`.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что команда `load_data` сохраняет дату публикации '
+            'отзыва из CSV.'
+        )
+        assert Comment.objects.count() == 3
+        title = Title.objects.get(pk=review.title_id)
+        expected = [
+            score for score in
+            Review.objects.filter(title=title).values_list('score', flat=True)
+        ]
+        assert title.rating == sum(expected) / len(expected), (
+            'Проверьте, что после загрузки данных рейтинг произведений '
+            'пересчитан.'
+        )
+
+    def test_02_load_data_workers(self):
+        call_command('load_data', workers=2, chunk_size=256)
+
+        with open(
+            os.path.join(DATA_DIR, 'review.csv'), encoding='utf-8', newline=''
+        ) as csv_file:
+            expected = {
+                int(row['id']): row['text'] for row in csv.DictReader(csv_file)
+            }
+        loaded = dict(Review.objects.values_list('id', 'text'))
+        assert loaded == expected, (
+            'Проверьте, что при разборе CSV в несколько процессов '
+            'многострочные отзывы загружаются без потерь.'
+        )
+
+    def test_03_parallel_parsing_is_bounded(self, tmp_path):
+        submitted = []
+
+        class Executor(ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(*args, **kwargs)
+
+        command = Command()
+        command.path = tmp_path
+        command.chunk_size = 1
+        command.upsert = False
+        command.max_pending = 2
+        table = next(table for table in TABLES if table.parse is parse_review)
+        shutil.copy(os.path.join(DATA_DIR, table.filename), tmp_path)
+        with Executor(2) as command.executor:
+            rows = command.read_rows(table)
+            next(rows)
+            assert len(submitted) == 2, (
+                'Проверьте, что `load_data --workers` держит в работе не '
+                'больше `2 * workers` частей файла.'
+            )
+            assert len(list(rows)) + 1 == len(
+                split_csv(tmp_path / table.filename, 1)[1]
+            )
+
+    def test_04_split_csv_keeps_quoted_lines(self, tmp_path):
+        path = tmp_path / 'data.csv'
+        path.write_text(
+            'id,text\n1,"first\nsecond"\n2,plain\n3,"a ""quoted""\nline"\n',
+            encoding='utf-8',
+        )
+        fieldnames, ranges = split_csv(path, 1)
+        rows = []
+        for start, end in ranges:
+            rows.extend(
+                values for values, _ in
+                parse_chunk(dict, path, fieldnames, start, end)
+            )
+        assert [row['text'] for row in rows] == [
+            'first\nsecond', 'plain', 'a "quoted"\nline'
+        ]
+
+    def test_05_load_data_upsert(self, tmp_path):
+        shutil.copytree(DATA_DIR, tmp_path, dirs_exist_ok=True)
+        call_command('load_data', path=tmp_path, upsert=True)
+        title = Title.objects.get(pk=1)
+        title.name = 'Изменено через API'
+        title.save()
+
+        reviews_path = tmp_path / 'review.csv'
+        reviews_csv = reviews_path.read_text(encoding='utf-8')
+        reviews_path.write_text(
+            reviews_csv.replace('Ставлю десять звёзд!', 'Обновленный отзыв'),
+            encoding='utf-8',
+        )
+        with open(tmp_path / 'category.csv', 'a', encoding='utf-8') as file:
+            file.write('\n4,Поэзия,poetry')
+
+        out = io.StringIO()
+        call_command('load_data', path=tmp_path, upsert=True, stdout=out)
+        report = out.getvalue()
+        assert 'review.csv: добавлено 0, обновлено 1,' in report, (
+            'Проверьте, что в режиме `--upsert` обновляются только '
+            'измененные строки.'
+        )
+        assert 'category.csv: добавлено 1, обновлено 0,' in report
+        assert Review.objects.get(pk=1).text.startswith('Обновленный отзыв')
+        assert Category.objects.filter(slug='poetry').exists()
+        assert Title.objects.get(pk=1).name == 'Изменено через API', (
+            'Проверьте, что в режиме `--upsert` неизмененные строки CSV '
+            'не перезаписываются.'
+        )
+
+    def test_06_dump_data_round_trip(self, tmp_path):
+        call_command('load_data')
+        call_command('dump_data', tmp_path / 'csv', stdout=io.StringIO())
+        call_command(
+            'dump_data', tmp_path / 'jsonl', format='jsonl',
+            stdout=io.StringIO()
+        )
+        reviews = dict(Review.objects.values_list('id', 'text'))
+
+        with open(tmp_path / 'jsonl' / 'review.jsonl', encoding='utf-8') as f:
+            dumped = {row['id']: row['text'] for row in map(json.loads, f)}
+        assert dumped == reviews, (
+            'Проверьте, что команда `dump_data --format jsonl` выгружает '
+            'все отзывы.'
+        )
+
+        call_command('flush', interactive=False)
+        call_command('load_data', path=tmp_path / 'csv', stdout=io.StringIO())
+        assert dict(Review.objects.values_list('id', 'text')) == reviews, (
+            'Проверьте, что CSV-выгрузку команды `dump_data` можно загрузить '
+            'командой `load_data`.'
+        )
+        assert Title.objects.get(pk=1).genre.exists()
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Search:
+
+    TITLES_URL = '/api/v1/titles/'
+    SEARCH_URL = '/api/v1/search/'
+
+    def test_01_titles_search(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+
+        response = client.get(f'{self.TITLES_URL}?search=терминат')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[0]['id']
+        ], (
+            'Проверьте, что параметр `search` эндпоинта '
+            f'`{self.TITLES_URL}` ищет по названию произведения.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?search=yippie')
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что параметр `search` эндпоинта '
+            f'`{self.TITLES_URL}` ищет по описанию произведения.'
+        )
+
+    def test_02_search_follows_updates(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+
+        response = client.get(f'{self.TITLES_URL}?search=терминатор')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        response = client.get(f'{self.TITLES_URL}?search=чужой')
+        assert response.json()['count'] == 1
+
+    def test_03_search_endpoint(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            user_client, titles[1]['id'], 'Отличный боевик', 9
+        ).json()
+
+        response = client.get(f'{self.SEARCH_URL}?search=боевик')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что эндпоинт `{self.SEARCH_URL}` доступен без '
+            'авторизации.'
+        )
+        data = response.json()
+        assert data['titles'] == []
+        assert [item['id'] for item in data['reviews']] == [review['id']], (
+            f'Проверьте, что эндпоинт `{self.SEARCH_URL}` ищет по тексту '
+            'отзывов.'
+        )
+        assert data['reviews'][0]['title'] == titles[1]['id']
+
+        response = client.get(self.SEARCH_URL)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
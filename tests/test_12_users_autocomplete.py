@@ -0,0 +1,67 @@
+import sqlite3
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12UsersAutocomplete:
+
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_prefix(self, admin_client, django_user_model):
+        for username, email in (
+            ('Alice', 'alice@yamdb.fake'),
+            ('alex', 'zed@yamdb.fake'),
+            ('bob', 'ALbert@yamdb.fake'),
+            ('carol', 'carol@yamdb.fake'),
+        ):
+            django_user_model.objects.create_user(
+                username=username, email=email
+            )
+
+        response = admin_client.get(f'{self.USERS_URL}?prefix=AL')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert isinstance(data, list), (
+            'Проверьте, что автодополнение `?prefix=` возвращает список без '
+            'пагинации.'
+        )
+        assert [user['username'] for user in data] == [
+            'alex', 'Alice', 'bob'
+        ], (
+            'Проверьте, что `?prefix=` без учета регистра ищет по началу '
+            'username и email.'
+        )
+
+        response = admin_client.get(f'{self.USERS_URL}?prefix=al&limit=1')
+        assert len(response.json()) == 1
+
+    def test_02_prefix_admin_only(self, user_client):
+        response = user_client.get(f'{self.USERS_URL}?prefix=a')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_03_prefix_without_upper_bound(self, admin_client):
+        for prefix in ('\U0010ffff', 'a\U0010ffff', '\ud7ff'):
+            response = admin_client.get(self.USERS_URL, {'prefix': prefix})
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что автодополнение не падает на префиксе, '
+                'который заканчивается последним символом Unicode.'
+            )
+
+    def test_04_plain_sqlite_insert(self, django_user_model):
+        """Запись пользователя без соединения Django, как в dbshell."""
+        name = connection.settings_dict['NAME']
+        with sqlite3.connect(name, uri=str(name).startswith('file:')) as db:
+            db.execute(
+                'INSERT INTO users_user (password, is_superuser, username, '
+                'first_name, last_name, email, is_staff, is_active, '
+                'date_joined, role, username_normalized, email_normalized) '
+                "VALUES ('', 0, 'plain', '', '', 'plain@yamdb.fake', 0, 1, "
+                "'2026-01-01', 'user', 'plain', 'plain@yamdb.fake')"
+            )
+        assert django_user_model.objects.filter(username='plain').exists(), (
+            'Проверьте, что таблица пользователей не зависит от функций, '
+            'которые регистрирует приложение на своих соединениях.'
+        )
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    CATEGORIES_URL = '/api/v1/categories/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_not_modified(self, client, admin_client,
+                             django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        etag = response.get('ETag')
+        assert etag and etag.startswith('W/'), (
+            f'Проверьте, что ответ на GET-запрос к `{self.TITLES_URL}` '
+            'содержит слабый ETag.'
+        )
+
+        with django_assert_num_queries(1):
+            response = client.get(
+                self.TITLES_URL, HTTP_IF_NONE_MATCH=etag
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается '
+            'ответ со статусом 304 и выполняется только запрос версий.'
+        )
+        assert response['ETag'] == etag
+
+        response = client.get(
+            f'{self.TITLES_URL}?year=1984', HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_etag_changes_on_write(self, client, admin_client,
+                                      user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_etag = client.get(self.TITLES_URL)['ETag']
+        category_etag = client.get(self.CATEGORIES_URL)['ETag']
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_etag = client.get(reviews_url)['ETag']
+
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=title_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка произведений: '
+            'в нем выводится рейтинг.'
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(
+            self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=category_etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Музыка', 'slug': 'music'}
+        )
+        response = client.get(
+            self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=category_etag
+        )
+        assert response.status_code == HTTPStatus.OK
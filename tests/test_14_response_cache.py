@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from tests.utils import create_categories, create_genre
+from titles.models import Category, ResourceVersion
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_served_from_cache(self, client, admin_client,
+                                  django_assert_num_queries):
+        create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(1):
+            cached = client.get(self.CATEGORIES_URL)
+        assert cached.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повторный GET-запрос к `{self.CATEGORIES_URL}` '
+            'отдается из кэша, из БД читается только версия ресурса.'
+        )
+        assert cached.json() == response.json()
+        assert cached['ETag'] == response['ETag']
+
+        with django_assert_num_queries(1):
+            response = client.get(
+                self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = client.get(f'{self.CATEGORIES_URL}?search=Книги')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что параметры запроса входят в ключ кэша.'
+        )
+
+    def test_02_invalidated_on_write(self, client, admin_client):
+        genres = create_genre(admin_client)
+        assert client.get(self.GENRES_URL).json()['count'] == len(genres)
+
+        admin_client.delete(f'{self.GENRES_URL}{genres[0]["slug"]}/')
+        assert client.get(self.GENRES_URL).json()['count'] == (
+            len(genres) - 1
+        ), (
+            'Проверьте, что удаление жанра сбрасывает кэш списка жанров.'
+        )
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Хоррор', 'slug': 'horror'}
+        )
+        slugs = [
+            genre['slug']
+            for genre in client.get(self.GENRES_URL).json()['results']
+        ]
+        assert 'horror' in slugs, (
+            'Проверьте, что создание жанра сбрасывает кэш списка жанров.'
+        )
+
+    def test_03_invalidated_on_admin_save(self, client, admin_client,
+                                          user_superuser):
+        categories = create_categories(admin_client)
+        client.get(self.CATEGORIES_URL)
+
+        site_client = Client()
+        site_client.force_login(user_superuser)
+        category = Category.objects.get(slug=categories[0]['slug'])
+        response = site_client.post(
+            f'/admin/titles/category/{category.pk}/change/',
+            data={'name': 'Кино', 'slug': category.slug},
+        )
+        assert response.status_code == HTTPStatus.FOUND
+        names = [
+            item['name']
+            for item in client.get(self.CATEGORIES_URL).json()['results']
+        ]
+        assert 'Кино' in names, (
+            'Проверьте, что изменение категории в админке сбрасывает кэш '
+            'списка категорий.'
+        )
+
+    def test_04_invalidated_by_other_process(self, client, admin_client):
+        """Запись в другом процессе меняет только версию в БД."""
+        categories = create_categories(admin_client)
+        response = client.get(self.CATEGORIES_URL)
+        Category.objects.filter(slug=categories[0]['slug']).update(
+            name='Кино'
+        )
+        ResourceVersion.objects.bump(ResourceVersion.CATEGORIES)
+
+        fresh = client.get(
+            self.CATEGORIES_URL, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        assert fresh.status_code == HTTPStatus.OK, (
+            'Проверьте, что закэшированный ETag не дает ответ 304 после '
+            'записи в другом процессе.'
+        )
+        names = [item['name'] for item in fresh.json()['results']]
+        assert 'Кино' in names, (
+            'Проверьте, что в ключ кэша ответов входит версия ресурса из '
+            '`ResourceVersion`, общая для всех процессов.'
+        )
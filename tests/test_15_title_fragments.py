@@ -0,0 +1,140 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+from titles.models import Category, Genre, ResourceVersion, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleFragments:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_title(self, client, title_id):
+        results = client.get(self.TITLES_URL).json()['results']
+        return next(item for item in results if item['id'] == title_id)
+
+    def test_01_list_from_fragments(self, client, admin_client,
+                                    django_assert_num_queries):
+        create_titles(admin_client)
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(3):
+            cached = client.get(self.TITLES_URL)
+        assert cached.json() == response.json(), (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'собирается из кэша: из БД читаются только версии, количество '
+            'и id страницы.'
+        )
+
+        title = response.json()['results'][0]
+        with django_assert_num_queries(3):
+            detail = client.get(f'{self.TITLES_URL}{title["id"]}/')
+        assert detail.json() == title, (
+            'Проверьте, что произведение из кэша читается через '
+            '`get_object()`: версии, объект и его жанры.'
+        )
+
+    def test_02_invalidated_by_dependencies(self, client, admin_client,
+                                            user_client):
+        titles, categories, genres = create_titles(admin_client)
+        title_id = titles[0]['id']
+        self.get_title(client, title_id)
+
+        create_single_review(user_client, title_id, 'text', 7)
+        assert self.get_title(client, title_id)['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+
+        category = Category.objects.get(slug=categories[0]['slug'])
+        category.name = 'Кино'
+        category.save()
+        assert self.get_title(client, title_id)['category']['name'] == (
+            'Кино'
+        ), 'Проверьте, что изменение категории сбрасывает кэш произведений.'
+
+        genre = Genre.objects.get(slug=genres[0]['slug'])
+        genre.name = 'Хоррор'
+        genre.save()
+        names = [
+            item['name']
+            for item in self.get_title(client, title_id)['genre']
+        ]
+        assert 'Хоррор' in names, (
+            'Проверьте, что изменение жанра сбрасывает кэш произведений.'
+        )
+
+        Title.objects.get(pk=title_id).genre.set([genre])
+        assert len(self.get_title(client, title_id)['genre']) == 1, (
+            'Проверьте, что изменение жанров произведения сбрасывает его кэш.'
+        )
+
+        category.delete()
+        assert self.get_title(client, title_id)['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш произведений.'
+        )
+        genre.delete()
+        assert self.get_title(client, title_id)['genre'] == []
+
+        admin_client.delete(f'{self.TITLES_URL}{title_id}/')
+        response = client.get(f'{self.TITLES_URL}{title_id}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_detail_checks_filters(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        assert client.get(url).status_code == HTTPStatus.OK
+
+        response = client.get(f'{url}?year={titles[0]["year"] + 1}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что произведение из кэша отдается только после '
+            '`get_object()` с фильтрами и проверками доступа.'
+        )
+
+    def test_04_written_by_other_process(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = f'{self.TITLES_URL}{title_id}/'
+        etag = client.get(url)['ETag']
+        self.get_title(client, title_id)
+
+        Title.objects.filter(pk=title_id).update(
+            name='Новое название', version=F('version') + 1
+        )
+        ResourceVersion.objects.bump(ResourceVersion.TITLES)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название', (
+            'Проверьте, что ключи представлений произведений зависят от '
+            'версии в БД: запись в другом процессе не сбрасывает кэш '
+            'этого процесса.'
+        )
+        assert self.get_title(client, title_id)['name'] == 'Новое название'
+
+    def test_05_review_keeps_other_titles(self, client, admin_client,
+                                          user_client):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(self.TITLES_URL)
+        rendered = [
+            query['sql'] for query in captured.captured_queries
+            if 'FROM "titles_title"' in query['sql']
+            and '"titles_title"."id" IN' in query['sql']
+        ]
+        assert len(rendered) == 1 and f'IN ({titles[0]["id"]})' in (
+            rendered[0]
+        ), (
+            'Проверьте, что новый отзыв сбрасывает кэш только своего '
+            'произведения, а не всех.'
+        )
+        assert self.get_title(client, titles[0]['id'])['rating'] == 7
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from tests.utils import create_categories, create_genre
+from titles.models import Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SlugFields:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def post_title(self, admin_client, name, genres, category):
+        return admin_client.post(self.TITLES_URL, data={
+            'name': name,
+            'year': 2000,
+            'genre': genres,
+            'category': category,
+            'description': 'Описание',
+        })
+
+    def test_01_slugs_resolved_from_map(self, admin_client,
+                                        django_assert_max_num_queries):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        category = create_categories(admin_client)[0]['slug']
+        response = self.post_title(admin_client, 'Первое', genres, category)
+        assert response.status_code == HTTPStatus.CREATED
+
+        with django_assert_max_num_queries(50) as captured:
+            response = self.post_title(
+                admin_client, 'Второе', genres, category
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert sorted(response.json()['genre']) == sorted(genres)
+        lookups = [
+            query['sql'] for query in captured.captured_queries
+            if 'WHERE "titles_genre"."slug"' in query['sql']
+            or 'WHERE "titles_category"."slug"' in query['sql']
+        ]
+        assert lookups == [], (
+            'Проверьте, что слаги жанров и категорий определяются по '
+            'процессному кэшу без запросов к БД.'
+        )
+
+    def test_02_map_invalidated_on_write(self, admin_client):
+        genres = [genre['slug'] for genre in create_genre(admin_client)]
+        category = create_categories(admin_client)[0]['slug']
+        self.post_title(admin_client, 'Первое', genres, category)
+
+        admin_client.delete(f'{self.GENRES_URL}{genres[0]}/')
+        response = self.post_title(admin_client, 'Второе', genres, category)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что удаление жанра сбрасывает кэш слагов.'
+        )
+        assert 'genre' in response.json()
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Ужасы', 'slug': genres[0]}
+        )
+        response = self.post_title(admin_client, 'Второе', genres, category)
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = self.post_title(
+            admin_client, 'Третье', genres, 'unknown'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'category' in response.json()
+
+    def warm_map(self, admin_client, genre, category):
+        """Заполняет карту слагов запросом, не прошедшим валидацию."""
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Прогрев', 'year': 'abc', 'genre': [genre],
+            'category': category, 'description': 'Описание',
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_stale_map(self, admin_client):
+        """Жанр удален и пересоздан мимо сигналов, как другим процессом."""
+        category = create_categories(admin_client)[0]['slug']
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        self.warm_map(admin_client, 'drama', category)
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM titles_genre WHERE slug = 'drama'")
+        response = self.post_title(admin_client, 'Первое', ['drama'], category)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что жанр, удаленный после заполнения карты слагов, '
+            'возвращает ошибку валидации, а не 500.'
+        )
+        assert 'genre' in response.json()
+        assert not Title.objects.exists(), (
+            'Проверьте, что произведение и его жанры сохраняются одной '
+            'транзакцией.'
+        )
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Драма', 'slug': 'drama'}
+        )
+        self.warm_map(admin_client, 'drama', category)
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM titles_genre WHERE slug = 'drama'")
+            cursor.execute(
+                "INSERT INTO titles_genre (name, slug) "
+                "VALUES ('Драма', 'drama')"
+            )
+        response = self.post_title(admin_client, 'Второе', ['drama'], category)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что пересозданный жанр находится по слагу заново.'
+        )
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17JWTUserCache:
+
+    ME_URL = '/api/v1/users/me/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    def test_01_user_not_selected(self, user_client,
+                                  django_assert_num_queries):
+        response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        with django_assert_num_queries(0):
+            cached = user_client.get(self.ME_URL)
+        assert cached.status_code == HTTPStatus.OK, (
+            'Проверьте, что аутентификация по JWT не запрашивает '
+            'пользователя из БД при каждом запросе.'
+        )
+        assert cached.json() == response.json()
+
+        user_client.patch(self.ME_URL, data={'bio': 'новое описание'})
+        assert user_client.get(self.ME_URL).json()['bio'] == (
+            'новое описание'
+        ), 'Проверьте, что изменение пользователя сбрасывает его кэш.'
+
+    def test_02_role_change_applied(self, admin_client, admin):
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        admin.role = admin.USER
+        admin.save()
+        response = admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Книги', 'slug': 'books'}
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что смена роли пользователя сразу учитывается '
+            'при проверке прав.'
+        )
+
+        admin.is_active = False
+        admin.save()
+        response = admin_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_stale_user_not_written_back(self, admin_client, admin):
+        assert admin_client.get(self.ME_URL).status_code == HTTPStatus.OK
+
+        type(admin).objects.filter(pk=admin.pk).update(
+            role=admin.USER, is_active=False
+        )
+        response = admin_client.patch(self.ME_URL, data={'bio': 'описание'})
+        assert response.status_code == HTTPStatus.OK
+        admin.refresh_from_db()
+        assert admin.bio == 'описание'
+        assert (admin.role, admin.is_active) == (admin.USER, False), (
+            'Проверьте, что изменение своих данных через `/users/me/` не '
+            'возвращает роль и флаги из кэша аутентификации, измененные '
+            'в БД другим процессом.'
+        )
@@ -0,0 +1,67 @@
+import pytest
+from django.conf import settings
+
+from reviews.models import Comment, Review
+from tests.utils import check_queries_not_growing, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18NPlusOne:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def create_authors(self, django_user_model, count, start):
+        return [
+            django_user_model.objects.create_user(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(start, start + count)
+        ]
+
+    def test_01_reviews_list(self, client, admin_client, django_user_model):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        created = []
+
+        def add_reviews(count):
+            for author in self.create_authors(
+                django_user_model, count, len(created)
+            ):
+                created.append(Review.objects.create(
+                    title_id=title_id, author=author, text='text', score=5
+                ))
+
+        check_queries_not_growing(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            add_reviews,
+            settings.POST_PER_PAGE,
+        )
+
+    def test_02_comments_list(self, client, admin_client, django_user_model,
+                              admin):
+        titles, _, _ = create_titles(admin_client)
+        review = Review.objects.create(
+            title_id=titles[0]['id'], author=admin, text='text', score=5
+        )
+        created = []
+
+        def add_comments(count):
+            for author in self.create_authors(
+                django_user_model, count, len(created)
+            ):
+                created.append(Comment.objects.create(
+                    review=review, author=author, text='text'
+                ))
+
+        check_queries_not_growing(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=review.title_id, review_id=review.pk
+            ),
+            add_comments,
+            settings.POST_PER_PAGE,
+        )
@@ -0,0 +1,75 @@
+import pytest
+
+from reviews.models import Comment, Review
+from titles.models import Category, Genre, GenreTitle, Title
+
+ROWS = 100
+PAGE_SIZES = (10, ROWS)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19PageScaling:
+
+    @pytest.fixture
+    def catalog(self, django_user_model):
+        django_user_model.objects.bulk_create([
+            django_user_model(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(ROWS)
+        ])
+        Category.objects.bulk_create([
+            Category(name=f'Категория {idx}', slug=f'category{idx}')
+            for idx in range(ROWS)
+        ])
+        Genre.objects.bulk_create([
+            Genre(name=f'Жанр {idx}', slug=f'genre{idx}')
+            for idx in range(ROWS)
+        ])
+        Title.objects.bulk_create([
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx, category in enumerate(Category.objects.order_by('pk'))
+        ])
+        authors = django_user_model.objects.order_by('pk')
+        genres = Genre.objects.order_by('pk')
+        titles = list(Title.objects.order_by('pk'))
+        GenreTitle.objects.bulk_create([
+            GenreTitle(title=title, genre=genre)
+            for title, genre in zip(titles, genres)
+        ])
+        Review.objects.bulk_create([
+            Review(title=titles[0], author=author, text='text', score=5)
+            for author in authors
+        ])
+        review = Review.objects.earliest('pk')
+        Comment.objects.bulk_create([
+            Comment(review=review, author=author, text='text')
+            for author in authors
+        ])
+        return titles[0], review
+
+    def test_01_queries_do_not_scale(self, client, admin_client, catalog,
+                                     measure_page):
+        title, review = catalog
+        urls = (
+            (client, '/api/v1/categories/'),
+            (client, '/api/v1/genres/'),
+            (client, '/api/v1/titles/'),
+            (client, f'/api/v1/titles/{title.pk}/reviews/'),
+            (
+                client,
+                f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/',
+            ),
+            (admin_client, '/api/v1/users/'),
+        )
+        for user_client, url in urls:
+            counts = []
+            for page_size in PAGE_SIZES:
+                response, queries = measure_page(user_client, url, page_size)
+                assert len(response.json()['results']) == page_size
+                counts.append(queries)
+            assert counts[0] == counts[-1], (
+                f'Проверьте, что количество запросов к БД при GET-запросе к '
+                f'`{url}` не зависит от размера страницы: {counts[0]} при '
+                f'{PAGE_SIZES[0]} строках, {counts[-1]} при {PAGE_SIZES[-1]}.'
+            )
@@ -0,0 +1,93 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review
+from tests.utils import create_single_review, create_titles
+
+
+def get_selects(captured, table):
+    return [
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedLookups:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_create(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        data = {'text': 'text', 'score': 5}
+        user_client.get('/api/v1/users/me/')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(get_selects(captured, 'titles_title')) == 1, (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'одним запросом.'
+        )
+        assert get_selects(captured, 'reviews_review') == [], (
+            'Проверьте, что повторный отзыв отсекается ограничением '
+            '`unique_review`, а не предварительным запросом.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=9999), data=data
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_review_create_other_integrity_error(
+        self, admin_client, user_client, monkeypatch
+    ):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        def save(review, *args, **kwargs):
+            raise IntegrityError('NOT NULL constraint failed')
+
+        monkeypatch.setattr(Review, 'save', save)
+        with pytest.raises(IntegrityError):
+            user_client.post(url, data={'text': 'text', 'score': 5})
+
+    def test_03_comment_create(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        review = create_single_review(
+            admin_client, titles[0]['id'], 'text', 5
+        ).json()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review['id']
+        )
+        user_client.get('/api/v1/users/me/')
+
+        with CaptureQueriesContext(connection) as captured:
+            response = user_client.post(url, data={'text': 'comment'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(get_selects(captured, 'reviews_review')) == 1, (
+            'Проверьте, что при создании комментария отзыв загружается '
+            'одним запросом.'
+        )
+
+        response = user_client.post(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[1]['id'], review_id=review['id']
+            ),
+            data={'text': 'comment'},
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв ищется только среди отзывов произведения '
+            'из адреса.'
+        )
@@ -0,0 +1,31 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Routes:
+
+    def test_01_no_foreign_nested_routes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        urls = (
+            '/api/v1/reviews/',
+            '/api/v1/comments/',
+            f'/api/v1/titles/{title_id}/users/',
+            f'/api/v1/titles/{title_id}/titles/',
+            f'/api/v1/titles/{title_id}/reviews/1/genres/',
+        )
+        for url in urls:
+            assert admin_client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что адрес `{url}` не зарегистрирован: отзывы '
+                'доступны только внутри произведения, комментарии — внутри '
+                'отзыва.'
+            )
+
+    def test_02_api_root(self, client):
+        response = client.get('/api/v1/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'titles' in response.json()
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.pagination import (
+    CategoryPagination,
+    GenrePagination,
+    PubDatePagination,
+    TitlePagination,
+    UserPagination,
+)
+from tests.utils import create_categories, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Pagination:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_page_size(self, client, admin_client):
+        create_categories(admin_client)
+        data = client.get(self.CATEGORIES_URL, {'page_size': 1}).json()
+        assert len(data['results']) == 1, (
+            f'Проверьте, что эндпоинт `{self.CATEGORIES_URL}` принимает '
+            'параметр `page_size`.'
+        )
+        assert data['count'] == 2
+
+        request = Request(
+            APIRequestFactory().get(self.CATEGORIES_URL, {'page_size': 1000})
+        )
+        paginator = CategoryPagination()
+        assert paginator.get_page_size(request) == paginator.max_page_size, (
+            'Проверьте, что размер страницы ограничен `max_page_size`.'
+        )
+        assert PageNumberPagination.page_size is None, (
+            'Проверьте, что класс `PageNumberPagination` DRF не изменяется: '
+            'у каждого ресурса свой класс пагинации.'
+        )
+
+    def test_02_without_count(self, client, admin_client,
+                              django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        params = {'count': 'false', 'page_size': 1}
+        client.get(self.TITLES_URL, params)
+
+        with django_assert_num_queries(2):
+            response = client.get(self.TITLES_URL, params)
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что с параметром `count=false` количество объектов '
+            'не подсчитывается.'
+        )
+        assert len(data['results']) == 1
+        assert data['previous'] is None
+        assert 'page=2' in data['next']
+
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1
+        assert data['next'] is None
+        assert 'page=' not in data['previous']
+        names = {title['name'] for title in data['results']}
+        assert names < {title['name'] for title in titles}
+
+        response = client.get(self.TITLES_URL, {**params, 'page': 3})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_per_resource_sizes(self):
+        for pagination in (
+            UserPagination, CategoryPagination, GenrePagination,
+            TitlePagination, PubDatePagination,
+        ):
+            assert {'page_size', 'max_page_size'} <= set(
+                vars(pagination)
+            ), (
+                f'Проверьте, что `{pagination.__name__}` задает собственные '
+                '`page_size` и `max_page_size`.'
+            )
+        assert CategoryPagination.max_page_size > (
+            TitlePagination.max_page_size
+        ), (
+            'Проверьте, что справочник категорий можно получить большей '
+            'страницей, чем список произведений.'
+        )
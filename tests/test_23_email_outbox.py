@@ -0,0 +1,121 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPException
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, username):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_writes_outbox(self, client):
+        outbox_before_count = len(mail.outbox)
+        self.signup(client, 'first')
+        assert len(mail.outbox) == outbox_before_count, (
+            'Проверьте, что регистрация не отправляет письмо синхронно.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipient == 'first@yamdb.fake'
+        assert email.sent_at is None
+
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что команда `send_outbox` отправляет письма из '
+            'очереди.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None
+        assert email.body == '', (
+            'Проверьте, что после отправки текст письма с кодом '
+            'подтверждения стирается из очереди.'
+        )
+
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1, (
+            'Проверьте, что отправленное письмо не отправляется повторно.'
+        )
+
+    def test_02_retry_with_backoff(self, client, monkeypatch):
+        self.signup(client, 'first')
+        outbox_before_count = len(mail.outbox)
+
+        def fail(backend, messages):
+            raise SMTPException('сервер недоступен')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(EmailBackend, 'send_messages', fail)
+            call_command('send_outbox', '--once')
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1
+        assert email.sent_at is None
+        assert 'сервер недоступен' in email.last_error
+        assert email.send_after > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count
+
+        OutboxEmail.objects.update(
+            send_after=timezone.now() - timedelta(seconds=1)
+        )
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count + 1
+
+    def test_03_gives_up_after_max_attempts(self, client, settings):
+        self.signup(client, 'first')
+        OutboxEmail.objects.update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        )
+        outbox_before_count = len(mail.outbox)
+        call_command('send_outbox', '--once')
+        assert len(mail.outbox) == outbox_before_count
+
+    def test_04_last_failure_clears_body(self, client, settings,
+                                         monkeypatch):
+        self.signup(client, 'first')
+        OutboxEmail.objects.update(
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1
+        )
+
+        def fail(backend, messages):
+            raise SMTPException('сервер недоступен')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        call_command('send_outbox', '--once')
+        email = OutboxEmail.objects.get()
+        assert email.attempts == settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        assert email.body == '', (
+            'Проверьте, что после последней неудачной попытки текст письма '
+            'с кодом подтверждения стирается из очереди.'
+        )
+
+    def test_05_body_hidden_in_admin(self, client, user_superuser):
+        self.signup(client, 'first')
+        email = OutboxEmail.objects.get()
+        site_client = Client()
+        site_client.force_login(user_superuser)
+        response = site_client.get(
+            f'/admin/users/outboxemail/{email.pk}/change/'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert email.body not in response.content.decode(), (
+            'Проверьте, что админка не показывает текст письма с кодом '
+            'подтверждения.'
+        )
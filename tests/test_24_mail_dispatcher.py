@@ -0,0 +1,85 @@
+import pytest
+from django.core.mail import get_connection
+
+from users.mail import OutboxDispatcher, StubEmailBackend
+from users.models import OutboxEmail
+
+
+class FailingStubBackend(StubEmailBackend):
+
+    def write_message(self, message):
+        if message.to == ['broken@yamdb.fake']:
+            raise OSError('почтовый сервер отклонил письмо')
+        super().write_message(message)
+
+
+def enqueue(*recipients):
+    for recipient in recipients:
+        OutboxEmail.objects.enqueue(
+            'Тема', 'Текст', 'noreply@yamdb.com', recipient
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24MailDispatcher:
+
+    def get_connection(self, tmp_path, backend=StubEmailBackend):
+        return get_connection(
+            f'{backend.__module__}.{backend.__qualname__}',
+            fail_silently=False,
+            file_path=str(tmp_path),
+        )
+
+    def test_01_one_connection(self, tmp_path):
+        enqueue(*(f'user{idx}@yamdb.fake' for idx in range(5)))
+        connection = self.get_connection(tmp_path)
+        dispatcher = OutboxDispatcher(batch_size=2, connection=connection)
+
+        assert dispatcher.drain() == (5, 0)
+        assert connection.connections_opened == 1, (
+            'Проверьте, что все пачки отправляются через одно соединение.'
+        )
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_02_partial_failure(self, tmp_path):
+        enqueue(
+            'first@yamdb.fake', 'second@yamdb.fake', 'broken@yamdb.fake',
+            'fourth@yamdb.fake',
+        )
+        connection = self.get_connection(tmp_path, FailingStubBackend)
+        dispatcher = OutboxDispatcher(batch_size=10, connection=connection)
+
+        assert dispatcher.flush() == (2, 1)
+        emails = {
+            email.recipient: email for email in OutboxEmail.objects.all()
+        }
+        assert emails['first@yamdb.fake'].sent_at is not None
+        assert emails['second@yamdb.fake'].sent_at is not None
+        assert emails['broken@yamdb.fake'].attempts == 1, (
+            'Проверьте, что при ошибке повтор назначается только письму, '
+            'на котором отправка прервалась.'
+        )
+        assert emails['fourth@yamdb.fake'].sent_at is None
+        assert emails['fourth@yamdb.fake'].attempts == 0
+
+        assert dispatcher.flush() == (1, 0)
+        assert dispatcher.flush() == (0, 0)
+
+    def test_03_flush_policy(self, tmp_path):
+        connection = self.get_connection(tmp_path)
+        enqueue('first@yamdb.fake')
+        assert not OutboxDispatcher(
+            batch_size=2, flush_interval=60, connection=connection
+        ).is_ready(), (
+            'Проверьте, что неполная пачка ждет `flush_interval`.'
+        )
+        assert OutboxDispatcher(
+            batch_size=2, flush_interval=0, connection=connection
+        ).is_ready()
+        enqueue('second@yamdb.fake')
+        assert OutboxDispatcher(
+            batch_size=2, flush_interval=60, connection=connection
+        ).is_ready(), (
+            'Проверьте, что полная пачка отправляется сразу.'
+        )
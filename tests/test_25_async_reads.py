@@ -0,0 +1,201 @@
+import asyncio
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from api import async_views, cache, mixins
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.fixture(autouse=True)
+def async_urlconf(settings):
+    """Асинхронные маршруты выключены по умолчанию."""
+    settings.ASYNC_READ_URLCONF = 'api_yamdb.async_urls'
+
+
+@pytest.fixture
+def async_calls(monkeypatch):
+    """Число одновременно ожидаемых запросов к БД асинхронных представлений.
+
+    Возвращает словарь: total — всего вызовов, max_active — наибольшее
+    число одновременно выполнявшихся.
+    """
+    calls = {'total': 0, 'active': 0, 'max_active': 0}
+    run_query = async_views.run_query
+
+    async def tracked(func, *args, **kwargs):
+        calls['total'] += 1
+        calls['active'] += 1
+        calls['max_active'] = max(calls['max_active'], calls['active'])
+        try:
+            return await run_query(func, *args, **kwargs)
+        finally:
+            calls['active'] -= 1
+
+    monkeypatch.setattr(async_views, 'run_query', tracked)
+    return calls
+
+
+def async_get(path, data=None, **headers):
+    """GET через ASGI; параметры передаются в адресе.
+
+    AsyncClient в Django 3.2 теряет data у GET-запросов.
+    """
+    if data:
+        path = f'{path}?{urlencode(data)}'
+    return async_to_sync(AsyncClient().get)(path, **headers)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AsyncReads:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def create_catalog(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review = create_single_review(user_client, title_id, 'text', 8)
+        return title_id, review.json()['id']
+
+    def assert_same(self, client, path, data=None):
+        expected = client.get(path, data)
+        response = async_get(path, data)
+        assert response.status_code == expected.status_code, (
+            f'Проверьте, что GET-запрос к `{path}` через ASGI возвращает '
+            f'тот же статус, что и через WSGI: {expected.status_code}.'
+        )
+        assert response.json() == expected.json(), (
+            f'Проверьте, что GET-запрос к `{path}` через ASGI возвращает '
+            'те же данные, что и через WSGI.'
+        )
+        assert response.get('ETag') == expected.get('ETag'), (
+            f'Проверьте, что ETag ответа на GET-запрос к `{path}` не '
+            'зависит от того, каким приложением обработан запрос.'
+        )
+        return response
+
+    def test_01_same_responses(self, client, admin_client, user_client,
+                               async_calls):
+        title_id, review_id = self.create_catalog(admin_client, user_client)
+        reviews_url = f'{self.TITLES_URL}{title_id}/reviews/'
+        requests = (
+            ('/api/v1/categories/', None),
+            ('/api/v1/categories/', {'search': 'Фильм'}),
+            ('/api/v1/genres/', {'page_size': 2, 'page': 2}),
+            (self.TITLES_URL, None),
+            (self.TITLES_URL, {'page_size': 1, 'page': 2}),
+            (self.TITLES_URL, {'genre': 'horror'}),
+            (self.TITLES_URL, {'search': 'Терминатор'}),
+            (f'{self.TITLES_URL}{title_id}/', None),
+            (reviews_url, None),
+            (f'{reviews_url}{review_id}/', None),
+        )
+        for path, data in requests:
+            self.assert_same(client, path, data)
+        assert async_calls['total'] >= len(requests), (
+            'Проверьте, что GET-запросы к каталогу через ASGI обрабатываются '
+            'асинхронными представлениями из `api/async_views.py`.'
+        )
+
+    def test_02_errors(self, client, admin_client, user_client):
+        title_id, _ = self.create_catalog(admin_client, user_client)
+        for path, data in (
+            (f'{self.TITLES_URL}0/', None),
+            (f'{self.TITLES_URL}0/reviews/', None),
+            (f'{self.TITLES_URL}{title_id}/reviews/0/', None),
+            (self.TITLES_URL, {'page': 5}),
+            (self.TITLES_URL, {'year': 'abc'}),
+        ):
+            response = self.assert_same(client, path, data)
+            assert response.status_code in (
+                HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST
+            )
+
+        response = async_get(
+            self.TITLES_URL, authorization='Bearer invalid'
+        )
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что асинхронное чтение отклоняет запрос с '
+            'некорректным токеном, как и синхронное.'
+        )
+
+    def test_03_not_modified(self, admin_client, user_client, async_calls):
+        self.create_catalog(admin_client, user_client)
+        etag = async_get(self.TITLES_URL)['ETag']
+        async_calls['total'] = 0
+        response = async_get(self.TITLES_URL, **{'if-none-match': etag})
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что асинхронное чтение отвечает 304 при совпадении '
+            '`If-None-Match`.'
+        )
+        assert async_calls['total'] == 2, (
+            'Проверьте, что при совпадении `If-None-Match` асинхронное '
+            'чтение проверяет доступ и версии, не читая данные.'
+        )
+
+    def test_04_concurrent_queries(self, admin_client, user_client,
+                                   async_calls):
+        title_id, _ = self.create_catalog(admin_client, user_client)
+        async_get(f'{self.TITLES_URL}{title_id}/reviews/')
+        assert async_calls['max_active'] >= 3, (
+            'Проверьте, что для списка отзывов родитель, количество и '
+            'страница запрашиваются одновременно.'
+        )
+
+    def test_05_sync_fallback(self, client, admin_client, user_client,
+                              async_calls):
+        title_id, _ = self.create_catalog(admin_client, user_client)
+        reviews_url = f'{self.TITLES_URL}{title_id}/reviews/'
+        for path, data in (
+            (reviews_url, {'cursor': ''}),
+            (self.TITLES_URL, {'count': 'false'}),
+            (self.TITLES_URL, {'page': 'last'}),
+        ):
+            self.assert_same(client, path, data)
+        assert async_calls['total'] == 0, (
+            'Проверьте, что курсорная пагинация и список без подсчета '
+            'обрабатываются синхронными вьюсетами.'
+        )
+
+    def test_06_disabled_by_default(self, admin_client, user_client,
+                                    async_calls, settings):
+        settings.ASYNC_READ_URLCONF = None
+        self.create_catalog(admin_client, user_client)
+        response = async_get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert async_calls['total'] == 0, (
+            'Проверьте, что без `ASYNC_READ_URLCONF` запросы через ASGI '
+            'обрабатываются синхронными вьюсетами.'
+        )
+
+    def test_07_cache_off_event_loop(self, admin_client, user_client,
+                                     monkeypatch):
+        title_id, _ = self.create_catalog(admin_client, user_client)
+        on_loop = []
+        get_response_cache = cache.get_response_cache
+
+        def tracked():
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            else:
+                on_loop.append(True)
+            return get_response_cache()
+
+        monkeypatch.setattr(cache, 'get_response_cache', tracked)
+        monkeypatch.setattr(mixins, 'get_response_cache', tracked)
+        for path in (
+            '/api/v1/categories/',
+            '/api/v1/categories/',
+            self.TITLES_URL,
+            f'{self.TITLES_URL}{title_id}/',
+        ):
+            assert async_get(path).status_code == HTTPStatus.OK
+        assert not on_loop, (
+            'Проверьте, что асинхронные представления обращаются к кэшу '
+            'в пуле потоков, не блокируя цикл событий.'
+        )
@@ -0,0 +1,230 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory
+
+from api import throttling
+from api.throttling import (
+    CacheThrottleBackend,
+    IPThrottle,
+    LocMemThrottleBackend,
+    SlidingWindowThrottle,
+)
+
+
+@pytest.fixture
+def rates(monkeypatch):
+    """Задает частоты ограничений на время теста."""
+    def set_rates(**values):
+        for scope, rate in values.items():
+            monkeypatch.setitem(
+                SlidingWindowThrottle.THROTTLE_RATES, scope, rate
+            )
+
+    return set_rates
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемое время для ограничений: clock['now'] в секундах."""
+    now = {'now': 1000 * 60}
+    monkeypatch.setattr(
+        SlidingWindowThrottle, 'timer', lambda throttle: now['now']
+    )
+    return now
+
+
+def slow_down(backend, monkeypatch):
+    """Замедляет чтение счетчиков, чтобы одновременные запросы пересеклись."""
+    def slow(method):
+        def wrapper(*args, **kwargs):
+            time.sleep(0.005)
+            return method(*args, **kwargs)
+        return wrapper
+
+    if isinstance(backend, LocMemThrottleBackend):
+        monkeypatch.setattr(backend, 'roll', slow(backend.roll))
+        return
+    shared = backend.get_cache()
+    for name in ('get', 'get_many'):
+        monkeypatch.setattr(shared, name, slow(getattr(shared, name)))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthThrottling:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+
+    def token_attempt(self, client, username='valid_username', **extra):
+        return client.post(
+            self.URL_TOKEN,
+            data={'username': username, 'confirmation_code': '12345'},
+            **extra,
+        )
+
+    def test_01_username_limit_without_db(self, client, rates,
+                                          django_assert_num_queries):
+        rates(token_username='3/min')
+        client.post(
+            self.URL_SIGNUP,
+            data={'email': 'valid@yamdb.fake', 'username': 'valid_username'},
+        )
+        for _ in range(3):
+            response = self.token_attempt(client)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        with django_assert_num_queries(0):
+            response = self.token_attempt(client, 'Valid_Username')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что попытки получить токен на `{self.URL_TOKEN}` '
+            'сверх лимита для одного `username` отклоняются со статусом 429 '
+            'без запросов к БД.'
+        )
+        assert int(response['Retry-After']) > 0
+
+        response = self.token_attempt(client, 'other_username')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что лимит по `username` не затрагивает других '
+            'пользователей.'
+        )
+
+    def test_02_ip_limit(self, client, rates):
+        rates(signup_ip='3/min')
+        for idx in range(3):
+            response = client.post(self.URL_SIGNUP, data={
+                'email': f'user{idx}@yamdb.fake', 'username': f'user{idx}',
+            })
+            assert response.status_code == HTTPStatus.OK
+
+        response = client.post(self.URL_SIGNUP, data={
+            'email': 'user3@yamdb.fake', 'username': 'user3',
+        })
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что регистрация на `{self.URL_SIGNUP}` сверх лимита '
+            'для одного IP-адреса отклоняется со статусом 429.'
+        )
+
+        response = client.post(
+            self.URL_SIGNUP,
+            data={'email': 'user3@yamdb.fake', 'username': 'user3'},
+            REMOTE_ADDR='10.0.0.2',
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что лимит по IP-адресу не затрагивает других '
+            'клиентов.'
+        )
+
+    def test_03_forwarded_for_ignored(self, client, rates):
+        rates(token_ip='3/min')
+        statuses = [
+            self.token_attempt(
+                client, f'user{idx}', HTTP_X_FORWARDED_FOR=f'10.0.1.{idx}'
+            ).status_code
+            for idx in range(4)
+        ]
+        assert statuses[-1] == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что ограничение по IP-адресу нельзя обойти, меняя '
+            'заголовок `X-Forwarded-For` (настройка `NUM_PROXIES`).'
+        )
+
+    def test_04_sliding_window(self, client, rates, clock):
+        rates(token_username='4/min')
+        for _ in range(4):
+            self.token_attempt(client)
+        assert self.token_attempt(client).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+        clock['now'] += 60
+        assert self.token_attempt(client).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что в начале следующего окна учитываются запросы '
+            'предыдущего: окно скользящее, а не фиксированное.'
+        )
+
+        clock['now'] += 30
+        assert self.token_attempt(client).status_code == (
+            HTTPStatus.NOT_FOUND
+        ), (
+            'Проверьте, что вес запросов предыдущего окна уменьшается по '
+            'мере его удаления.'
+        )
+
+    def test_05_shared_backend(self, client, rates, monkeypatch):
+        rates(token_username='2/min')
+        monkeypatch.setattr(
+            throttling, 'throttle_backend', CacheThrottleBackend()
+        )
+        for _ in range(2):
+            self.token_attempt(client)
+        assert self.token_attempt(client).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), 'Проверьте ограничение с общим хранилищем в кэше Django.'
+
+        monkeypatch.setattr(
+            throttling, 'throttle_backend', CacheThrottleBackend()
+        )
+        assert self.token_attempt(client).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что счетчики CacheThrottleBackend общие для всех '
+            'экземпляров хранилища.'
+        )
+
+        cache.clear()
+        assert self.token_attempt(client).status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.parametrize(
+        'backend', [LocMemThrottleBackend, CacheThrottleBackend]
+    )
+    def test_06_concurrent_burst(self, rates, monkeypatch, backend):
+        rates(token_ip='5/min')
+        backend = backend()
+        slow_down(backend, monkeypatch)
+        monkeypatch.setattr(throttling, 'throttle_backend', backend)
+        view = type('View', (), {'throttle_scope': 'token'})()
+        request = APIRequestFactory().post(self.URL_TOKEN)
+        start = threading.Barrier(20)
+
+        def attempt(_):
+            throttle = IPThrottle()
+            start.wait()
+            return throttle.allow_request(request, view)
+
+        with ThreadPoolExecutor(20) as executor:
+            allowed = list(executor.map(attempt, range(20)))
+        assert sum(allowed) == 5, (
+            'Проверьте, что при одновременных запросах лимит не '
+            'превышается: счетчик увеличивается до проверки.'
+        )
+
+    @pytest.mark.parametrize(
+        'backend', [LocMemThrottleBackend, CacheThrottleBackend]
+    )
+    def test_07_rejected_not_counted(self, client, rates, monkeypatch,
+                                     backend):
+        rates(token_ip='5/min', token_username='2/min')
+        monkeypatch.setattr(throttling, 'throttle_backend', backend())
+        for _ in range(2):
+            assert self.token_attempt(client).status_code == (
+                HTTPStatus.NOT_FOUND
+            )
+        for _ in range(4):
+            assert self.token_attempt(client).status_code == (
+                HTTPStatus.TOO_MANY_REQUESTS
+            )
+
+        statuses = [
+            self.token_attempt(client, f'user{idx}').status_code
+            for idx in range(3)
+        ]
+        assert statuses == [HTTPStatus.NOT_FOUND] * 3, (
+            'Проверьте, что запрос, отклоненный ограничением по username, '
+            'не учитывается в ограничении по IP-адресу.'
+        )
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    """Соединение с файловой SQLite с настройками проекта."""
+    path = tmp_path / 'profile.sqlite3'
+    default = connections['default']
+    wrapper = type(default)(
+        {**default.settings_dict, 'NAME': str(path)}, alias='profile'
+    )
+    wrapper.ensure_connection()
+    yield wrapper, path
+    wrapper.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SqliteProfile:
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    def test_01_pragmas(self, file_database):
+        wrapper, _ = file_database
+        assert self.pragma(wrapper, 'journal_mode') == 'wal', (
+            'Проверьте, что новое соединение SQLite переводится в режим WAL.'
+        )
+        assert self.pragma(wrapper, 'synchronous') == 1, (
+            'Проверьте, что для соединения SQLite задан synchronous=NORMAL.'
+        )
+        assert self.pragma(wrapper, 'busy_timeout') == (
+            settings.SQLITE_PRAGMAS['busy_timeout']
+        )
+        assert self.pragma(wrapper, 'mmap_size') == (
+            settings.SQLITE_PRAGMAS['mmap_size']
+        )
+
+    def test_02_persistent_connection(self, file_database):
+        wrapper, _ = file_database
+        raw_connection = wrapper.connection
+        wrapper.close_if_unusable_or_obsolete()
+        assert wrapper.connection is raw_connection, (
+            'Проверьте, что соединение с БД переживает запрос '
+            '(CONN_MAX_AGE).'
+        )
+
+    def test_03_immediate_transactions(self, file_database):
+        wrapper, path = file_database
+        wrapper.set_autocommit(
+            False, force_begin_transaction_with_broken_autocommit=True
+        )
+        other = sqlite3.connect(path, timeout=0)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match='locked'):
+                other.execute('BEGIN IMMEDIATE')
+        finally:
+            other.close()
+            wrapper.rollback()
+            wrapper.set_autocommit(True)
+
+    def test_04_invalid_transaction_mode(self):
+        default = connections['default']
+        wrapper = type(default)(
+            {
+                **default.settings_dict,
+                'OPTIONS': {'transaction_mode': 'LAZY'},
+            },
+            alias='invalid',
+        )
+        with pytest.raises(ImproperlyConfigured):
+            wrapper.transaction_mode
@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 check_name_and_slug_patterns = (
     (
         {
@@ -304,3 +307,24 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def count_queries(client, url):
+    """Количество запросов к БД при GET-запросе к url."""
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    return len(captured)
+
+
+def check_queries_not_growing(client, url, add_rows, rows_count):
+    """Число запросов страницы не должно зависеть от числа строк на ней."""
+    add_rows(1)
+    expected = count_queries(client, url)
+    add_rows(rows_count - 1)
+    actual = count_queries(client, url)
+    assert actual == expected, (
+        f'Проверьте, что количество запросов к БД при GET-запросе к `{url}` '
+        f'не растет с числом строк на странице: {expected} запросов для '
+        f'одной строки, {actual} для {rows_count}.'
+    )